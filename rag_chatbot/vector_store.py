@@ -7,19 +7,27 @@ Uses ChromaDB for:
 - Persistent storage
 """
 
+import asyncio
+import importlib.util
+import json
+import logging
 import os
+import shutil
+import tempfile
 from typing import Optional
+from urllib.parse import urlparse
 from dataclasses import dataclass
 
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
+import numpy as np
+
+# chromadb is slow to import, so only check that it is installed here and
+# import it when a VectorStore is created
+CHROMADB_AVAILABLE = importlib.util.find_spec("chromadb") is not None
 
 from .document_processor import DocumentChunk, ProcessedDocument
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SearchResult:
@@ -32,6 +40,399 @@ class SearchResult:
     page_number: Optional[int] = None
 
 
+def _cuda_available() -> bool:
+    """Check for a usable CUDA device without requiring torch"""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def _percentile_token_length(
+    tokenizer,
+    texts: list[str],
+    percentile: float = 95,
+    sample_size: int = 512,
+) -> int:
+    """Token length at the given percentile over a sample of texts"""
+    sample = texts[:sample_size]
+    if not sample:
+        return 0
+    lengths = [len(ids) for ids in tokenizer(sample, truncation=False)["input_ids"]]
+    return int(np.ceil(np.percentile(lengths, percentile)))
+
+
+class _SentenceTransformerEmbeddingFunction:
+    """
+    Sentence-transformers embedding function with explicit device placement.
+    
+    Used for GPU inference, where the model can run in FP16 so matmuls hit
+    tensor cores and activations take half the memory bandwidth.
+    """
+    
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cuda",
+        fp16: bool = True,
+        batch_size: int = 128,
+    ):
+        from sentence_transformers import SentenceTransformer
+        
+        self.model = SentenceTransformer(model_name, device=device)
+        if fp16:
+            self.model = self.model.half()
+        self.batch_size = batch_size
+    
+    def __call__(self, input: list[str]) -> list[list[float]]:
+        """ChromaDB embedding function interface"""
+        return self.encode(input).tolist()
+    
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into L2-normalized float32 vectors"""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return embeddings.astype(np.float32)
+    
+    def calibrate_max_seq_length(self, texts: list[str], percentile: float = 95) -> int:
+        """Truncate inputs at the corpus percentile length (never above the model's limit)"""
+        length = _percentile_token_length(self.model.tokenizer, texts, percentile)
+        if length:
+            self.model.max_seq_length = min(self.model.max_seq_length, length)
+        return self.model.max_seq_length
+
+
+class _OnnxEmbeddingFunction:
+    """
+    Sentence embedding function served by ONNX Runtime.
+    
+    The Hugging Face model is exported to ONNX and dynamically quantized to
+    INT8 on first use (this downloads the model and takes a while); the
+    quantized graph is cached on disk so later runs only pay the load. Output
+    follows sentence-transformers: inputs truncated at max_seq_length, mean
+    pooling over the attention mask followed by L2 normalization. INT8
+    vectors are close to, but not the same as, the FP32 model's.
+    """
+    
+    MODEL_FILE = "model_quantized.onnx"
+    
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        batch_size: int = 64,
+        max_seq_length: int = 256,
+    ):
+        from transformers import AutoTokenizer
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        
+        hub_name = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        model_dir = os.path.join(cache_dir, hub_name.replace("/", "__") + "-int8")
+        
+        if not os.path.isfile(os.path.join(model_dir, self.MODEL_FILE)):
+            # One-time export + dynamic (weights-only) INT8 quantization,
+            # written to a temporary directory and renamed into place so an
+            # interrupted export is never mistaken for a finished one
+            os.makedirs(cache_dir, exist_ok=True)
+            staging_dir = tempfile.mkdtemp(dir=cache_dir, prefix=".export-")
+            try:
+                model = ORTModelForFeatureExtraction.from_pretrained(hub_name, export=True)
+                quantizer = ORTQuantizer.from_pretrained(model)
+                quantizer.quantize(
+                    save_dir=staging_dir,
+                    quantization_config=AutoQuantizationConfig.avx512_vnni(
+                        is_static=False, per_channel=False
+                    ),
+                )
+                AutoTokenizer.from_pretrained(hub_name).save_pretrained(staging_dir)
+                
+                # Leftover of an export interrupted before this fix
+                if os.path.isdir(model_dir) and not os.path.isfile(os.path.join(model_dir, self.MODEL_FILE)):
+                    shutil.rmtree(model_dir)
+                try:
+                    os.replace(staging_dir, model_dir)
+                except OSError:
+                    # Another process finished the same export first
+                    if not os.path.isfile(os.path.join(model_dir, self.MODEL_FILE)):
+                        raise
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name=self.MODEL_FILE
+        )
+        self.batch_size = batch_size
+        self.max_seq_length = max_seq_length
+    
+    def __call__(self, input: list[str]) -> list[list[float]]:
+        """ChromaDB embedding function interface"""
+        return self.encode(input).tolist()
+    
+    def calibrate_max_seq_length(self, texts: list[str], percentile: float = 95) -> int:
+        """Truncate inputs at the corpus percentile length (never above the current limit)"""
+        length = _percentile_token_length(self.tokenizer, texts, percentile)
+        if length:
+            self.max_seq_length = min(self.max_seq_length, length)
+        return self.max_seq_length
+    
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into L2-normalized float32 vectors"""
+        # Batch similar lengths together so each batch pads to a tight maximum
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_texts = [texts[i] for i in order]
+        
+        batches = []
+        for start in range(0, len(sorted_texts), self.batch_size):
+            encoded = self.tokenizer(
+                sorted_texts[start:start + self.batch_size],
+                padding="longest",
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            token_embeddings = self.model(**encoded).last_hidden_state
+            
+            # Mean pooling over real (non-padding) tokens
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings
+
+
+class _EmbeddingStore:
+    """
+    Append-only FP16 embedding matrix backed by a numpy memmap.
+    
+    Keeps a copy of every chunk embedding outside ChromaDB at half the size
+    of FP32, so the ANN index can be rebuilt without re-running the model.
+    Rows are addressed by chunk id through an append-only log next to the
+    matrix file (one JSON line per added or removed id), so each update
+    writes only the change. Removed rows are tombstoned and reclaimed by
+    compaction once they make up half of the rows. Adding an id that is
+    already stored replaces its row (the old one is tombstoned).
+    """
+    
+    INITIAL_CAPACITY = 1024
+    COMPACT_MIN_TOMBSTONES = 1024  # Small stores are not worth rewriting
+    
+    def __init__(self, path_prefix: str):
+        self.path_prefix = path_prefix
+        self.log_path = path_prefix + ".log"
+        self.ids: list[str] = []  # chunk id per row, "" once removed
+        self.dim: Optional[int] = None
+        self.generation = 0  # Compaction writes the matrix to a new file
+        self._matrix: Optional[np.memmap] = None
+        self._rows: dict[str, int] = {}
+        self._tombstones = 0
+        
+        os.makedirs(os.path.dirname(path_prefix) or ".", exist_ok=True)
+        
+        legacy_index_path = path_prefix + ".json"
+        if os.path.exists(self.log_path):
+            self._replay_log()
+        elif os.path.exists(legacy_index_path):
+            self._load_legacy_index(legacy_index_path)
+        
+        if self.dim is not None and os.path.exists(self.matrix_path):
+            capacity = os.path.getsize(self.matrix_path) // (self.dim * np.dtype(np.float16).itemsize)
+            if capacity:
+                self._matrix = np.memmap(
+                    self.matrix_path, dtype=np.float16, mode="r+",
+                    shape=(capacity, self.dim),
+                )
+        
+        if os.path.exists(legacy_index_path):
+            # Rewrite in the log format, dropping the old tombstones
+            self._compact()
+            os.remove(legacy_index_path)
+    
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._rows
+    
+    @property
+    def matrix_path(self) -> str:
+        if self.generation == 0:
+            return self.path_prefix + ".f16"
+        return f"{self.path_prefix}.{self.generation}.f16"
+    
+    @property
+    def capacity(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+    
+    def append(self, ids: list[str], embeddings: np.ndarray):
+        """Append embeddings for the given chunk ids"""
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+        
+        start = len(self.ids)
+        self._ensure_capacity(start + len(ids))
+        self._matrix[start:start + len(ids)] = embeddings
+        # Rows reach the disk before the log refers to them
+        self._matrix.flush()
+        
+        self.ids.extend(ids)
+        for offset, chunk_id in enumerate(ids):
+            self._assign(chunk_id, start + offset)
+        self._append_log([("add", chunk_id) for chunk_id in ids])
+        if self._should_compact():
+            self._compact()
+    
+    def get(self, ids: list[str]) -> np.ndarray:
+        """Return FP32 embeddings for the given chunk ids"""
+        rows = [self._rows[chunk_id] for chunk_id in ids]
+        return self._matrix[rows].astype(np.float32)
+    
+    def remove(self, ids: list[str]):
+        """Tombstone the rows for the given chunk ids"""
+        removed = []
+        for chunk_id in ids:
+            row = self._rows.pop(chunk_id, None)
+            if row is not None:
+                self.ids[row] = ""
+                removed.append(("remove", chunk_id))
+        if not removed:
+            return
+        
+        self._tombstones += len(removed)
+        if self._should_compact():
+            self._compact()
+        else:
+            self._append_log(removed)
+    
+    def truncate(self):
+        """Forget all rows, keeping the allocated file for reuse"""
+        self.ids = []
+        self._rows = {}
+        self._tombstones = 0
+        self._write_log()
+    
+    def _assign(self, chunk_id: str, row: int):
+        """Point chunk_id at row, tombstoning the row it had before"""
+        old_row = self._rows.get(chunk_id)
+        if old_row is not None:
+            self.ids[old_row] = ""
+            self._tombstones += 1
+        self._rows[chunk_id] = row
+    
+    def _should_compact(self) -> bool:
+        return self._tombstones >= self.COMPACT_MIN_TOMBSTONES and 2 * self._tombstones >= len(self.ids)
+    
+    def _ensure_capacity(self, needed: int):
+        capacity = self.capacity
+        if needed <= capacity:
+            return
+        
+        new_capacity = max(self.INITIAL_CAPACITY, capacity * 2, needed)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        
+        # Grow the file in place; existing rows are untouched
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * np.dtype(np.float16).itemsize)
+        self._matrix = np.memmap(
+            self.matrix_path, dtype=np.float16, mode="r+",
+            shape=(new_capacity, self.dim),
+        )
+    
+    def _compact(self):
+        """Copy the live rows to a new matrix file and switch the log to it"""
+        live_rows = [row for row, chunk_id in enumerate(self.ids) if chunk_id]
+        old_matrix_path = self.matrix_path
+        
+        self.generation += 1
+        self.ids = [self.ids[row] for row in live_rows]
+        self._rows = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+        self._tombstones = 0
+        
+        if self.dim is not None:
+            matrix = np.memmap(
+                self.matrix_path, dtype=np.float16, mode="w+",
+                shape=(max(self.INITIAL_CAPACITY, len(live_rows)), self.dim),
+            )
+            if live_rows:
+                matrix[:len(live_rows)] = self._matrix[live_rows]
+            matrix.flush()
+            self._matrix = matrix
+        
+        # The log swap is the commit point: until then the old log and
+        # matrix are still a consistent pair
+        self._write_log()
+        if os.path.exists(old_matrix_path):
+            os.remove(old_matrix_path)
+    
+    def _header(self) -> list:
+        return [("dim", self.dim), ("generation", self.generation)]
+    
+    def _write_log(self):
+        """Atomically replace the log with the current rows"""
+        entries = self._header() + [("add", chunk_id) for chunk_id in self.ids]
+        tmp_path = self.log_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_path)
+    
+    def _append_log(self, entries: list):
+        if not os.path.exists(self.log_path):
+            self._write_log()
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+    
+    def _replay_log(self):
+        valid_bytes = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn final write
+                op, value = json.loads(line)
+                if op == "add":
+                    self.ids.append(value)
+                    self._assign(value, len(self.ids) - 1)
+                elif op == "remove":
+                    row = self._rows.pop(value, None)
+                    if row is not None:
+                        self.ids[row] = ""
+                        self._tombstones += 1
+                elif op == "dim":
+                    self.dim = value
+                elif op == "generation":
+                    self.generation = value
+                valid_bytes += len(line)
+        
+        if valid_bytes < os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_bytes)
+    
+    def _load_legacy_index(self, index_path: str):
+        """Read the whole-file JSON index written by earlier versions"""
+        with open(index_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.ids = state["ids"]
+        self.dim = state["dim"]
+        for row, chunk_id in enumerate(self.ids):
+            if chunk_id:
+                self._assign(chunk_id, row)
+        self._tombstones = len(self.ids) - len(self._rows)
+
+
 class VectorStore:
     """
     ChromaDB-based vector store for document chunks.
@@ -43,11 +444,21 @@ class VectorStore:
     - Metadata filtering
     """
     
+    MAX_BATCH_SIZE = 5000  # Stay under ChromaDB's max batch size
+    
     def __init__(
         self,
         collection_name: str = "legal_documents",
         persist_directory: Optional[str] = None,
         embedding_model: str = "all-MiniLM-L6-v2",
+        backend: str = "torch",
+        precision: str = "fp16",
+        hnsw_M: int = 24,
+        hnsw_construction_ef: int = 128,
+        hnsw_search_ef: int = 100,
+        store_embeddings: bool = False,
+        calibrate_seq_length: bool = False,
+        url: Optional[str] = None,
     ):
         """
         Initialize the vector store.
@@ -56,6 +467,32 @@ class VectorStore:
             collection_name: Name for the ChromaDB collection
             persist_directory: Directory for persistent storage
             embedding_model: Sentence transformer model to use
+            backend: Embedding backend - "torch" (sentence-transformers) or
+                "onnx-int8" (quantized ONNX Runtime; the first use downloads,
+                exports and quantizes the model, and falls back to PyTorch if
+                optimum is not installed). The backend is recorded in the
+                collection metadata, and opening a non-empty collection with
+                a different backend raises ValueError, since vectors from the
+                two are not interchangeable.
+            precision: "fp16" runs the model in half precision on CUDA when a
+                GPU is available; CPU inference always stays FP32
+            hnsw_M: HNSW graph degree (links per node)
+            hnsw_construction_ef: HNSW candidate list size while indexing
+            hnsw_search_ef: HNSW candidate list size while querying
+            store_embeddings: Keep an FP16 memmap copy of all embeddings in
+                persist_directory (created if missing, also in server mode),
+                so reset() can rebuild the index without re-embedding
+            calibrate_seq_length: On the first add_document, set the model's
+                max_seq_length to the p95 token length of up to 512 chunks so
+                long outliers stop inflating batch padding. Trades a little
+                recall on the longest chunks for throughput.
+            url: Address of a ChromaDB server (e.g. "http://localhost:8000").
+                When set, the store talks to the server instead of a local
+                persistent client and add_document_async becomes available.
+            
+        Note:
+            HNSW parameters are fixed when the collection is created. To apply
+            new values to an existing store, reset() it and re-add documents.
         """
         if not CHROMADB_AVAILABLE:
             raise ImportError("ChromaDB required. Install with: pip install chromadb")
@@ -63,30 +500,131 @@ class VectorStore:
         self.collection_name = collection_name
         self.persist_directory = persist_directory or "./chroma_db"
         self.embedding_model_name = embedding_model
+        self.backend = backend
+        self.precision = precision
+        self.hnsw_M = hnsw_M
+        self.hnsw_construction_ef = hnsw_construction_ef
+        self.hnsw_search_ef = hnsw_search_ef
+        
+        self.url = url
+        self._async_collection = None
+        
+        import chromadb
+        from chromadb.config import Settings
         
         # Initialize ChromaDB
-        self.client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        if url:
+            self.client = chromadb.HttpClient(
+                **self._server_address(),
+                settings=Settings(anonymized_telemetry=False)
+            )
+        else:
+            self.client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=Settings(anonymized_telemetry=False)
+            )
         
         # Get or create collection with embedding function
         self._embedding_function = self._create_embedding_function()
+        # Checked before get_or_create_collection, which in some chromadb
+        # versions overwrites an existing collection's metadata
+        self._check_embedding_backend()
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
             embedding_function=self._embedding_function,
-            metadata={"hnsw:space": "cosine"}
+            metadata=self._collection_metadata()
+        )
+        
+        self.calibrate_seq_length = calibrate_seq_length
+        self._seq_length_calibrated = False
+        
+        # Optional FP16 copy of the embeddings (needs an embedding function we can call)
+        self._embedding_store = None
+        if store_embeddings and self._embedding_function is not None:
+            self._embedding_store = _EmbeddingStore(
+                os.path.join(self.persist_directory, f"{collection_name}.embeddings")
+            )
+    
+    def _collection_metadata(self) -> dict:
+        """HNSW index configuration and embedding backend for the collection"""
+        return {
+            "hnsw:space": "cosine",
+            "hnsw:M": self.hnsw_M,
+            "hnsw:construction_ef": self.hnsw_construction_ef,
+            "hnsw:search_ef": self.hnsw_search_ef,
+            "embedding_backend": self.embedding_backend,
+        }
+    
+    def _check_embedding_backend(self):
+        """
+        Refuse to open a collection embedded by a different backend: its
+        vectors and this store's query embeddings would not be comparable.
+        An empty collection is dropped so it is recreated under this backend.
+        """
+        try:
+            existing = self.client.get_collection(
+                name=self.collection_name,
+                embedding_function=self._embedding_function,
+            )
+        except Exception:
+            # Not created yet (the error type differs between chromadb versions)
+            return
+        
+        # Collections created before the backend was recorded were embedded
+        # with the FP32 sentence-transformers model
+        stored = (existing.metadata or {}).get("embedding_backend", "torch")
+        if stored == self.embedding_backend:
+            return
+        
+        if existing.count() == 0:
+            self.client.delete_collection(self.collection_name)
+            return
+        
+        raise ValueError(
+            f"Collection '{self.collection_name}' was embedded with the '{stored}' "
+            f"backend, but this store embeds with '{self.embedding_backend}'. Open it "
+            f"with backend='{stored}', or delete the collection and re-add its documents."
         )
     
     def _create_embedding_function(self):
-        """Create embedding function for ChromaDB"""
+        """Create embedding function for ChromaDB, setting self.embedding_backend"""
+        # FP16 on a GPU gives the same vectors as the FP32 model up to rounding
+        self.embedding_backend = "torch"
+        
+        if _cuda_available():
+            try:
+                return _SentenceTransformerEmbeddingFunction(
+                    self.embedding_model_name,
+                    device="cuda",
+                    fp16=self.precision == "fp16",
+                )
+            except Exception:
+                logger.warning("CUDA embedding model unavailable; using CPU inference", exc_info=True)
+        
+        if self.backend == "onnx-int8":
+            try:
+                function = _OnnxEmbeddingFunction(
+                    self.embedding_model_name,
+                    cache_dir=os.path.join(self.persist_directory, "onnx"),
+                )
+                self.embedding_backend = "onnx-int8"
+                return function
+            except Exception:
+                logger.warning(
+                    "ONNX INT8 embedding backend unavailable; using sentence-transformers",
+                    exc_info=True,
+                )
+        
         try:
             from chromadb.utils import embedding_functions
             return embedding_functions.SentenceTransformerEmbeddingFunction(
                 model_name=self.embedding_model_name
             )
         except Exception:
-            # Fallback to default
+            logger.warning(
+                "sentence-transformers unavailable; using ChromaDB's default embedding function",
+                exc_info=True,
+            )
             return None
     
     def add_document(self, document: ProcessedDocument) -> int:
@@ -102,30 +640,145 @@ class VectorStore:
         if not document.chunks:
             return 0
         
-        ids = []
-        documents = []
-        metadatas = []
-        
-        for chunk in document.chunks:
-            ids.append(chunk.chunk_id)
-            documents.append(chunk.content)
-            metadatas.append({
-                "doc_id": document.doc_id,
-                "filename": document.filename,
-                "section": chunk.section or "",
-                "page_number": chunk.page_number or 0,
-                "chunk_id": chunk.chunk_id,
-            })
-        
-        # Add to collection
+        ids, documents, metadatas = self._prepare_chunks(document)
+        
+        if self.calibrate_seq_length and not self._seq_length_calibrated:
+            calibrate = getattr(self._embedding_function, "calibrate_max_seq_length", None)
+            if calibrate is not None:
+                calibrate(documents)
+            self._seq_length_calibrated = True
+        
+        if self._embedding_store is None:
+            # Add to collection
+            self.collection.add(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas,
+            )
+            return len(ids)
+        
+        # Embed once, hand ChromaDB the vectors directly and keep the FP16
+        # copy only once the add has succeeded
+        embeddings = self._embed(documents)
         self.collection.add(
             ids=ids,
+            embeddings=embeddings.tolist(),
             documents=documents,
             metadatas=metadatas,
         )
+        self._embedding_store.append(ids, embeddings.astype(np.float16))
         
         return len(ids)
     
+    def _prepare_chunks(self, document: ProcessedDocument) -> tuple[list, list, list]:
+        """Build the ids, documents and metadatas lists for a document's chunks"""
+        n = len(document.chunks)
+        ids = [None] * n
+        documents = [None] * n
+        metadatas = [None] * n
+        
+        # Document-level fields are shared; each chunk copies the template
+        template = {
+            "doc_id": document.doc_id,
+            "filename": document.filename,
+        }
+        
+        for i, chunk in enumerate(document.chunks):
+            ids[i] = chunk.chunk_id
+            documents[i] = chunk.content
+            metadata = template.copy()
+            metadata["section"] = chunk.section or ""
+            metadata["page_number"] = chunk.page_number or 0
+            metadata["chunk_id"] = chunk.chunk_id
+            metadatas[i] = metadata
+        
+        return ids, documents, metadatas
+    
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts with the collection's embedding function"""
+        encode = getattr(self._embedding_function, "encode", None)
+        if encode is not None:
+            return encode(texts)
+        return np.asarray(self._embedding_function(texts), dtype=np.float32)
+    
+    async def add_document_async(
+        self,
+        document: ProcessedDocument,
+        batch_size: int = 256,
+        max_concurrency: int = 8,
+    ) -> int:
+        """
+        Add a processed document through the async ChromaDB server client.
+        
+        Chunks are embedded in one batched pass off the event loop, then
+        inserted as concurrent batches.
+        
+        Args:
+            document: ProcessedDocument with chunks
+            batch_size: Chunks per insert request
+            max_concurrency: Maximum insert requests in flight
+            
+        Returns:
+            Number of chunks added
+        """
+        if not self.url:
+            raise ValueError("add_document_async requires a ChromaDB server url")
+        
+        if not document.chunks:
+            return 0
+        
+        ids, documents, metadatas = self._prepare_chunks(document)
+        
+        vectors = None
+        embeddings = None
+        if self._embedding_function is not None:
+            vectors = await asyncio.to_thread(self._embed, documents)
+            embeddings = vectors.tolist()
+        
+        collection = await self._get_async_collection()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def add_batch(start: int):
+            end = start + batch_size
+            async with semaphore:
+                await collection.add(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end] if embeddings is not None else None,
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                )
+        
+        await asyncio.gather(*(add_batch(start) for start in range(0, len(ids), batch_size)))
+        if self._embedding_store is not None and vectors is not None:
+            self._embedding_store.append(ids, vectors.astype(np.float16))
+        return len(ids)
+    
+    async def _get_async_collection(self):
+        """Lazily connect the async client to the collection"""
+        if self._async_collection is None:
+            import chromadb
+            from chromadb.config import Settings
+            
+            client = await chromadb.AsyncHttpClient(
+                **self._server_address(),
+                settings=Settings(anonymized_telemetry=False)
+            )
+            self._async_collection = await client.get_or_create_collection(
+                name=self.collection_name,
+                metadata=self._collection_metadata()
+            )
+        return self._async_collection
+    
+    def _server_address(self) -> dict:
+        """Host/port/ssl arguments for the ChromaDB HTTP clients"""
+        parsed = urlparse(self.url if "://" in self.url else f"http://{self.url}")
+        ssl = parsed.scheme == "https"
+        return {
+            "host": parsed.hostname or "localhost",
+            "port": parsed.port or (443 if ssl else 8000),
+            "ssl": ssl,
+        }
+    
     def search(
         self,
         query: str,
@@ -143,40 +796,78 @@ class VectorStore:
         Returns:
             List of SearchResult objects
         """
+        return self.search_batch([query], n_results=n_results, doc_filter=doc_filter)[0]
+    
+    def search_batch(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        doc_filter: Optional[str] = None,
+    ) -> list[list[SearchResult]]:
+        """
+        Search for relevant chunks for several queries at once.
+        
+        All queries are embedded in a single batched forward pass and sent
+        to ChromaDB as one query call.
+        
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+            doc_filter: Optional document ID to filter by
+            
+        Returns:
+            One list of SearchResult objects per query, in query order
+        """
+        if not queries:
+            return []
+        
         # Build filter
         where_filter = None
         if doc_filter:
             where_filter = {"doc_id": doc_filter}
         
+        # Embed queries ourselves when the embedding function supports batch
+        # encoding; otherwise let ChromaDB embed the list in one call
+        encode = getattr(self._embedding_function, "encode", None)
+        if encode is not None:
+            query_args = {"query_embeddings": encode(list(queries)).tolist()}
+        else:
+            query_args = {"query_texts": list(queries)}
+        
         # Query collection
         results = self.collection.query(
-            query_texts=[query],
+            **query_args,
             n_results=n_results,
             where=where_filter,
             include=["documents", "metadatas", "distances"]
         )
         
         # Convert to SearchResult objects
-        search_results = []
+        batch_results = []
         
-        if results and results['ids'] and results['ids'][0]:
-            for i, chunk_id in enumerate(results['ids'][0]):
-                # Convert distance to similarity score (cosine)
-                distance = results['distances'][0][i] if results['distances'] else 0
-                score = 1 - distance  # Convert distance to similarity
-                
-                metadata = results['metadatas'][0][i] if results['metadatas'] else {}
-                
-                search_results.append(SearchResult(
-                    chunk_id=chunk_id,
-                    content=results['documents'][0][i],
-                    score=score,
-                    metadata=metadata,
-                    section=metadata.get('section'),
-                    page_number=metadata.get('page_number'),
-                ))
+        for q in range(len(queries)):
+            search_results = []
+            
+            if results and results['ids'] and results['ids'][q]:
+                for i, chunk_id in enumerate(results['ids'][q]):
+                    # Convert distance to similarity score (cosine)
+                    distance = results['distances'][q][i] if results['distances'] else 0
+                    score = 1 - distance  # Convert distance to similarity
+                    
+                    metadata = results['metadatas'][q][i] if results['metadatas'] else {}
+                    
+                    search_results.append(SearchResult(
+                        chunk_id=chunk_id,
+                        content=results['documents'][q][i],
+                        score=score,
+                        metadata=metadata,
+                        section=metadata.get('section'),
+                        page_number=metadata.get('page_number'),
+                    ))
+            
+            batch_results.append(search_results)
         
-        return search_results
+        return batch_results
     
     def delete_document(self, doc_id: str) -> int:
         """
@@ -188,27 +879,87 @@ class VectorStore:
         Returns:
             Number of chunks deleted
         """
-        # Get all chunks for this document
-        results = self.collection.get(
-            where={"doc_id": doc_id},
-            include=["metadatas"]
-        )
-        
-        if results and results['ids']:
-            self.collection.delete(ids=results['ids'])
-            return len(results['ids'])
+        # Fetch only the ids (no metadata or documents) and delete exactly those
+        ids = self.collection.get(where={"doc_id": doc_id}, include=[])['ids']
+        if not ids:
+            return 0
         
-        return 0
+        for start in range(0, len(ids), self.MAX_BATCH_SIZE):
+            self.collection.delete(ids=ids[start:start + self.MAX_BATCH_SIZE])
+        if self._embedding_store is not None:
+            self._embedding_store.remove(ids)
+        return len(ids)
     
     def clear(self):
-        """Clear all documents from the collection"""
-        # Delete and recreate collection
+        """
+        Clear all documents from the collection.
+        
+        Deletes rows in place so the collection and its HNSW index
+        configuration are kept; use reset() to rebuild the collection.
+        """
+        existing = self.collection.get(include=[])['ids']
+        for start in range(0, len(existing), self.MAX_BATCH_SIZE):
+            self.collection.delete(ids=existing[start:start + self.MAX_BATCH_SIZE])
+        
+        if self._embedding_store is not None:
+            self._embedding_store.truncate()
+    
+    def reset(
+        self,
+        hnsw_M: Optional[int] = None,
+        hnsw_construction_ef: Optional[int] = None,
+        hnsw_search_ef: Optional[int] = None,
+    ):
+        """
+        Drop and recreate the collection, optionally with new HNSW parameters.
+        
+        With store_embeddings enabled the existing chunks are re-indexed from
+        the stored FP16 embeddings; otherwise all documents are removed and
+        must be re-added.
+        """
+        if hnsw_M is not None:
+            self.hnsw_M = hnsw_M
+        if hnsw_construction_ef is not None:
+            self.hnsw_construction_ef = hnsw_construction_ef
+        if hnsw_search_ef is not None:
+            self.hnsw_search_ef = hnsw_search_ef
+        
+        snapshot = None
+        if self._embedding_store is not None:
+            snapshot = self.collection.get(include=["documents", "metadatas"])
+        
         self.client.delete_collection(self.collection_name)
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
             embedding_function=self._embedding_function,
-            metadata={"hnsw:space": "cosine"}
+            metadata=self._collection_metadata()
         )
+        
+        if not snapshot or not snapshot['ids']:
+            return
+        
+        # Re-index from the stored vectors instead of re-running the model;
+        # chunks without a stored vector (added before it was enabled) are re-embedded
+        stored = [i for i, chunk_id in enumerate(snapshot['ids']) if chunk_id in self._embedding_store]
+        missing = [i for i, chunk_id in enumerate(snapshot['ids']) if chunk_id not in self._embedding_store]
+        
+        for start in range(0, len(stored), self.MAX_BATCH_SIZE):
+            batch = stored[start:start + self.MAX_BATCH_SIZE]
+            ids = [snapshot['ids'][i] for i in batch]
+            self.collection.add(
+                ids=ids,
+                embeddings=self._embedding_store.get(ids).tolist(),
+                documents=[snapshot['documents'][i] for i in batch],
+                metadatas=[snapshot['metadatas'][i] for i in batch],
+            )
+        
+        for start in range(0, len(missing), self.MAX_BATCH_SIZE):
+            batch = missing[start:start + self.MAX_BATCH_SIZE]
+            self.collection.add(
+                ids=[snapshot['ids'][i] for i in batch],
+                documents=[snapshot['documents'][i] for i in batch],
+                metadatas=[snapshot['metadatas'][i] for i in batch],
+            )
     
     def get_stats(self) -> dict:
         """Get collection statistics"""
@@ -227,13 +978,15 @@ class VectorStore:
         if results and results['metadatas']:
             for meta in results['metadatas']:
                 doc_id = meta.get('doc_id')
-                if doc_id and doc_id not in docs:
-                    docs[doc_id] = {
+                if not doc_id:
+                    continue
+                doc = docs.get(doc_id)
+                if doc is None:
+                    doc = docs[doc_id] = {
                         "doc_id": doc_id,
                         "filename": meta.get('filename', 'Unknown'),
                         "chunk_count": 0,
                     }
-                if doc_id:
-                    docs[doc_id]["chunk_count"] += 1
+                doc["chunk_count"] += 1
         
         return list(docs.values())
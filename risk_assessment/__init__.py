@@ -19,13 +19,42 @@ from .models import (
     RiskSummary,
     Recommendation,
 )
-from .keyword_library import KeywordLibrary
-from .fast_scanner import FastScanner
-from .ai_analyzer import AIAnalyzer
-from .risk_scorer import RiskScorer
-from .document_aggregator import DocumentAggregator
-from .visualizations import RiskVisualizer
-from .risk_assessment_engine import RiskAssessmentEngine
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .keyword_library import KeywordLibrary
+    from .fast_scanner import FastScanner
+    from .ai_analyzer import AIAnalyzer
+    from .risk_scorer import RiskScorer
+    from .document_aggregator import DocumentAggregator, IncrementalAggregator
+    from .visualizations import RiskVisualizer
+    from .risk_assessment_engine import RiskAssessmentEngine
+
+# Heavier components are imported on first access (PEP 562) so importing the
+# package for its models does not pull in numpy, the scanner tables, etc.
+_LAZY_IMPORTS = {
+    "KeywordLibrary": ".keyword_library",
+    "FastScanner": ".fast_scanner",
+    "AIAnalyzer": ".ai_analyzer",
+    "RiskScorer": ".risk_scorer",
+    "DocumentAggregator": ".document_aggregator",
+    "IncrementalAggregator": ".document_aggregator",
+    "RiskVisualizer": ".visualizations",
+    "RiskAssessmentEngine": ".risk_assessment_engine",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 __version__ = "1.0.0"
 __all__ = [
@@ -40,6 +69,7 @@ __all__ = [
     "AIAnalyzer",
     "RiskScorer",
     "DocumentAggregator",
+    "IncrementalAggregator",
     "RiskVisualizer",
     "RiskAssessmentEngine",
 ]
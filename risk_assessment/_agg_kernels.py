@@ -0,0 +1,80 @@
+"""
+Aggregation Kernels
+
+Fused reductions over the per-clause score / severity / category arrays
+used by the document aggregator. With Numba installed the loop version is
+JIT-compiled (and cached on disk) so one pass replaces several NumPy
+reductions; without it the NumPy version is used.
+"""
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _scan_scores_loop(scores, severities, categories, n_severities, n_categories):
+    """Single-pass reduction; compiled by Numba when available"""
+    total = np.zeros(1, scores.dtype)
+    severity_counts = np.zeros(n_severities, np.int64)
+    cat_counts = np.zeros(n_categories, np.int64)
+    cat_sums = np.zeros(n_categories, np.float64)
+    cat_max = np.zeros(n_categories, scores.dtype)
+    cat_min = np.zeros(n_categories, scores.dtype)
+
+    for i in range(scores.shape[0]):
+        score = scores[i]
+        category = categories[i]
+        total[0] += score
+        severity_counts[severities[i]] += 1
+        if cat_counts[category] == 0:
+            cat_max[category] = score
+            cat_min[category] = score
+        else:
+            if score > cat_max[category]:
+                cat_max[category] = score
+            if score < cat_min[category]:
+                cat_min[category] = score
+        cat_counts[category] += 1
+        cat_sums[category] += score
+
+    return total, severity_counts, cat_counts, cat_sums, cat_max, cat_min
+
+
+def _scan_scores_numpy(scores, severities, categories, n_severities, n_categories):
+    """NumPy reductions with the same results as the loop version"""
+    severity_counts = np.bincount(severities, minlength=n_severities)
+    cat_counts = np.bincount(categories, minlength=n_categories)
+    cat_sums = np.bincount(categories, weights=scores, minlength=n_categories)
+    cat_max = np.full(n_categories, scores.min())
+    cat_min = np.full(n_categories, scores.max())
+    np.maximum.at(cat_max, categories, scores)
+    np.minimum.at(cat_min, categories, scores)
+    # Categories without clauses read 0, as in the loop version
+    empty = cat_counts == 0
+    cat_max[empty] = 0
+    cat_min[empty] = 0
+
+    return scores.sum(keepdims=True), severity_counts, cat_counts, cat_sums, cat_max, cat_min
+
+
+if NUMBA_AVAILABLE:
+    _scan_scores_kernel = numba.njit(cache=True)(_scan_scores_loop)
+else:
+    _scan_scores_kernel = _scan_scores_numpy
+
+
+def scan_scores(scores, severities, categories, n_severities, n_categories):
+    """
+    Score total, severity counts and per-category count / sum / max / min.
+    
+    The total is a Python number; the rest are arrays indexed by code, with
+    max and min 0 for categories that have no clauses.
+    """
+    total, *per_code = _scan_scores_kernel(
+        scores, severities, categories, n_severities, n_categories
+    )
+    return (total.item(), *per_code)
@@ -5,11 +5,35 @@ Layer 2 of the risk assessment system.
 Performs deep AI-powered analysis of clauses to understand context and implications.
 """
 
+import hashlib
 import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Faster parser for model responses when available; both raise ValueError
+# subclasses on malformed input
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 from .models import (
     RiskCategory,
@@ -29,6 +53,166 @@ class AnalysisContext:
     contract_value: Optional[float] = None
 
 
+# Model output strings mapped to enums, built once rather than per parsed clause
+_CATEGORY_MAP = MappingProxyType({
+    "financial": RiskCategory.FINANCIAL,
+    "legal_liability": RiskCategory.LEGAL_LIABILITY,
+    "termination": RiskCategory.TERMINATION,
+    "intellectual_property": RiskCategory.INTELLECTUAL_PROPERTY,
+    "confidentiality": RiskCategory.CONFIDENTIALITY,
+    "dispute_resolution": RiskCategory.DISPUTE_RESOLUTION,
+    "compliance": RiskCategory.COMPLIANCE,
+    "operational": RiskCategory.OPERATIONAL,
+})
+
+_SEVERITY_MAP = MappingProxyType({
+    "LOW": SeverityLevel.LOW,
+    "MEDIUM": SeverityLevel.MEDIUM,
+    "HIGH": SeverityLevel.HIGH,
+    "CRITICAL": SeverityLevel.CRITICAL,
+})
+
+# JSON schema requested for each analyzed clause
+_CLAUSE_RESULT_FORMAT = """{
+  "risk_category": "financial|legal_liability|termination|intellectual_property|confidentiality|dispute_resolution|compliance|operational",
+  "severity": "LOW|MEDIUM|HIGH|CRITICAL",
+  "risk_score": <0-100>,
+  "confidence": <0-100>,
+  "clause_type": "<type of clause, e.g., 'liability limitation', 'indemnification', 'termination'>",
+  "primary_risk": "<One sentence describing the main danger>",
+  "detailed_explanation": "<2-3 sentences explaining WHY this is risky in plain English>",
+  "specific_concerns": [
+    "<Concern 1>",
+    "<Concern 2>"
+  ],
+  "impact_if_triggered": "<What bad thing could happen?>",
+  "likelihood": "<How likely is this to cause problems? LOW/MEDIUM/HIGH>",
+  "recommendation": "<What should the user do about this?>",
+  "alternative_language": "<Suggest better wording, or null if clause is acceptable>",
+  "red_flags": ["<flag1>", "<flag2>"],
+  "mitigating_factors": ["<factor1>", "<factor2>"],
+  "positive_elements": ["<element1>", "<element2>"],
+  "negotiation_priority": "MUST_ADDRESS|SHOULD_NEGOTIATE|NICE_TO_HAVE|ACCEPTABLE",
+  "market_comparison": "<How does this compare to typical contracts?>"
+}"""
+
+
+# Static parts of the clause analysis prompts; only the clause text,
+# keywords and context block vary per request
+_CLAUSE_PROMPT_HEADER = """Analyze this contract clause for potential risks.
+
+CLAUSE:
+"""
+
+_CLAUSE_PROMPT_FOOTER = f"""
+
+Respond in this EXACT JSON format:
+{_CLAUSE_RESULT_FORMAT}
+
+Think step by step:
+1. What is this clause trying to accomplish?
+2. Who does it favor?
+3. What's the worst-case scenario?
+4. Is this standard practice or unusual?
+5. How would I advise my client?"""
+
+_MULTI_CLAUSE_ENTRY_FORMAT = _CLAUSE_RESULT_FORMAT.replace("{", '{\n  "clause_id": "<id of the clause>",', 1)
+
+_MULTI_CLAUSE_PROMPT_FOOTER = f"""
+
+Respond with a JSON object {{"analyses": [...]}} containing exactly one entry per clause, in the order given.
+Each entry must use this EXACT JSON format:
+{_MULTI_CLAUSE_ENTRY_FORMAT}
+
+Analyze every clause independently, thinking step by step about what it accomplishes, who it favors, the worst-case scenario and whether it is standard practice."""
+
+
+@lru_cache(maxsize=64)
+def _format_context_block(
+    document_type: str,
+    user_role: str,
+    industry: str,
+    jurisdiction: str,
+    contract_value: Optional[float],
+) -> str:
+    value_line = f"- Contract value: ${contract_value:,.2f}" if contract_value else ""
+    return (
+        "CONTEXT:\n"
+        f"- Document type: {document_type}\n"
+        f"- Your client's role: {user_role}\n"
+        f"- Industry: {industry}\n"
+        f"- Jurisdiction: {jurisdiction}\n"
+        f"{value_line}"
+    )
+
+
+def _context_block(context: AnalysisContext) -> str:
+    """CONTEXT section of the clause prompts, cached per distinct context"""
+    return _format_context_block(
+        context.document_type,
+        context.user_role,
+        context.industry,
+        context.jurisdiction,
+        context.contract_value,
+    )
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+# API statuses with which Groq may reject a streamed request that it would
+# serve without streaming (e.g. stream=True with JSON mode)
+_STREAM_REJECTED_STATUSES = frozenset({400, 422})
+
+
+@lru_cache(maxsize=None)
+def _connection_error_types() -> tuple[type[Exception], ...]:
+    """Timeout and connection errors, including the Groq SDK's own"""
+    try:
+        from groq import APIConnectionError
+    except ImportError:
+        return (TimeoutError, ConnectionError)
+    return (APIConnectionError, TimeoutError, ConnectionError)
+
+
+def _is_request_error(error: Exception) -> bool:
+    """
+    True for errors that say nothing about streaming support (rate limits,
+    auth, server errors, timeouts, connection failures); these are re-raised,
+    not retried without streaming.
+    """
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status not in _STREAM_REJECTED_STATUSES
+    return isinstance(error, _connection_error_types())
+
+
+class _LRUCache:
+    """Thread-safe in-memory LRU cache with the get/set subset of diskcache.Cache"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key, value) -> bool:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        return True
+
+
 class AIAnalyzer:
     """
     AI-powered deep analysis using Groq Llama 3.1 70B.
@@ -44,28 +228,129 @@ class AIAnalyzer:
     MODEL = "llama-3.1-8b-instant"
     MAX_TOKENS = 2000
     TEMPERATURE = 0.3  # Lower temperature for more consistent analysis
+    MAX_CONCURRENT_REQUESTS = 8  # In-flight Groq requests, to respect RPS limits
+    BATCH_TOKEN_BUDGET = 1500  # Estimated input tokens per multi-clause request
+    MAX_CLAUSES_PER_REQUEST = 10
+    MAX_BATCH_OUTPUT_TOKENS = 8000
+    CACHE_SIZE = 4096  # Clause analyses kept by the in-memory cache
+    CACHE_SIZE_LIMIT_BYTES = 2 ** 30  # 1GB cap for the on-disk cache
+    CACHE_FORMAT = "2"  # Bump when the pickled ClauseRisk layout changes (2: slots models)
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        cache_dir: Optional[str] = None,
+        stream: bool = True,
+    ):
         """
         Initialize the AI Analyzer.
         
         Args:
             api_key: Groq API key. If not provided, reads from GROQ_API_KEY env var.
+            max_concurrent_requests: Upper bound on simultaneous Groq requests
+                across all threads using this analyzer
+            cache_dir: Directory for a persistent clause-analysis cache. Requires
+                diskcache; otherwise analyses are cached in memory only.
+            stream: Stream Groq responses (a request whose stream breaks
+                before any output, or that Groq rejects when streamed, is
+                retried without streaming)
         """
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         self._client = None
+        self._client_lock = threading.Lock()
+        self._request_semaphore = threading.Semaphore(max_concurrent_requests)
+        self.stream = stream
+        
+        if cache_dir and DISKCACHE_AVAILABLE:
+            self._cache = diskcache.Cache(
+                cache_dir,
+                size_limit=self.CACHE_SIZE_LIMIT_BYTES,
+                eviction_policy="least-recently-used",
+            )
+        else:
+            self._cache = _LRUCache(self.CACHE_SIZE)
     
     @property
     def client(self):
-        """Lazy initialization of Groq client"""
+        """Lazy initialization of Groq client (once, even from pool threads)"""
         if self._client is None:
-            try:
-                from groq import Groq
-                self._client = Groq(api_key=self.api_key)
-            except ImportError:
-                raise ImportError("Please install groq: pip install groq")
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        from groq import Groq
+                        self._client = Groq(api_key=self.api_key)
+                    except ImportError:
+                        raise ImportError("Please install groq: pip install groq")
         return self._client
     
+    def _complete(self, **kwargs) -> str:
+        """
+        Issue a Groq chat completion and return the message content.
+        
+        Streams the response so tokens are consumed as they are generated.
+        If the stream breaks before its first chunk, or Groq rejects the
+        streamed request as invalid (400/422), this request is retried once
+        without streaming; rate-limit, auth, server, timeout and connection
+        errors are raised as they are. Throttled by the request semaphore.
+        """
+        with self._request_semaphore:
+            if self.stream:
+                chunks = []
+                received = False
+                try:
+                    for chunk in self.client.chat.completions.create(stream=True, **kwargs):
+                        received = True
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            chunks.append(delta)
+                    return "".join(chunks)
+                except Exception as error:
+                    # A partly delivered response is not requested again
+                    if received or _is_request_error(error):
+                        raise
+            
+            response = self.client.chat.completions.create(**kwargs)
+            return response.choices[0].message.content
+    
+    def _cache_key(
+        self,
+        clause_text: str,
+        context: AnalysisContext,
+        keyword_matches: list[KeywordMatch] = None,
+    ) -> str:
+        """Key for a clause analysis: everything that goes into the prompt"""
+        keywords = ",".join(km.keyword for km in (keyword_matches or []))
+        raw = "|".join((
+            self.CACHE_FORMAT,
+            self.MODEL,
+            context.document_type,
+            context.user_role,
+            context.industry,
+            context.jurisdiction,
+            str(context.contract_value),
+            keywords,
+            clause_text,
+        ))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _copy_risk(
+        risk: ClauseRisk,
+        clause_id: str,
+        keyword_matches: Optional[list[KeywordMatch]],
+    ) -> ClauseRisk:
+        """Copy of a clause analysis with fresh lists, so callers can't alter the cache"""
+        return replace(
+            risk,
+            clause_id=clause_id,
+            specific_concerns=list(risk.specific_concerns),
+            red_flags=list(risk.red_flags),
+            mitigating_factors=list(risk.mitigating_factors),
+            positive_elements=list(risk.positive_elements),
+            keyword_matches=list(keyword_matches or []),
+        )
+    
     def analyze_clause(
         self,
         clause_id: str,
@@ -85,10 +370,15 @@ class AIAnalyzer:
         Returns:
             ClauseRisk with detailed risk assessment
         """
+        cache_key = self._cache_key(clause_text, context, keyword_matches)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return self._copy_risk(cached, clause_id, keyword_matches)
+        
         prompt = self._build_clause_analysis_prompt(clause_text, context, keyword_matches)
         
         try:
-            response = self.client.chat.completions.create(
+            content = self._complete(
                 model=self.MODEL,
                 messages=[
                     {"role": "system", "content": self._get_system_prompt()},
@@ -99,8 +389,10 @@ class AIAnalyzer:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
-            return self._parse_clause_risk(clause_id, clause_text, result, keyword_matches)
+            result = _json_loads(content)
+            risk = self._parse_clause_risk(clause_id, clause_text, result, keyword_matches)
+            self._cache.set(cache_key, self._copy_risk(risk, clause_id, keyword_matches))
+            return risk
             
         except Exception as e:
             # Fallback to rule-based assessment on API failure
@@ -111,28 +403,141 @@ class AIAnalyzer:
         clauses: list[tuple[str, str]],  # List of (clause_id, clause_text)
         context: AnalysisContext,
         keyword_matches_map: dict[str, list[KeywordMatch]] = None,
+        concurrency: int = 8,
     ) -> list[ClauseRisk]:
         """
         Analyze multiple clauses efficiently.
         
+        Uncached clauses are sorted by length and packed into multi-clause
+        requests bounded by BATCH_TOKEN_BUDGET so the fixed per-call overhead
+        is paid once per group; groups are sent concurrently. Results are in
+        input order.
+        
         Args:
             clauses: List of (clause_id, clause_text) tuples
             context: Analysis context
             keyword_matches_map: Dict mapping clause_id to keyword matches
+            concurrency: Number of worker threads issuing requests
             
         Returns:
             List of ClauseRisk assessments
         """
         keyword_matches_map = keyword_matches_map or {}
-        results = []
+        if not clauses:
+            return []
+        
+        results: list[Optional[ClauseRisk]] = [None] * len(clauses)
+        pending = []  # (index, clause_id, clause_text, keyword_matches)
         
-        for clause_id, clause_text in clauses:
+        for index, (clause_id, clause_text) in enumerate(clauses):
             keyword_matches = keyword_matches_map.get(clause_id, [])
-            risk = self.analyze_clause(clause_id, clause_text, context, keyword_matches)
-            results.append(risk)
+            cached = self._cache.get(self._cache_key(clause_text, context, keyword_matches))
+            if cached is not None:
+                results[index] = self._copy_risk(cached, clause_id, keyword_matches)
+            else:
+                pending.append((index, clause_id, clause_text, keyword_matches))
+        
+        chunks = self._chunk_by_token_budget(pending)
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {
+                executor.submit(self._analyze_clause_chunk, chunk, context): chunk
+                for chunk in chunks
+            }
+            
+            for future in as_completed(futures):
+                for item, risk in zip(futures[future], future.result()):
+                    results[item[0]] = risk
         
         return results
     
+    def _chunk_by_token_budget(self, pending: list[tuple]) -> list[list[tuple]]:
+        """
+        Greedily group pending clauses into requests under the token budget.
+        
+        Clauses are bucketed by length first so each request holds
+        similarly-sized clauses; each item keeps its original index.
+        """
+        chunks = []
+        current = []
+        current_tokens = 0
+        
+        sized = sorted(((_estimate_tokens(item[2]), item) for item in pending), key=lambda pair: pair[0])
+        
+        for tokens, item in sized:
+            if current and (
+                current_tokens + tokens > self.BATCH_TOKEN_BUDGET
+                or len(current) >= self.MAX_CLAUSES_PER_REQUEST
+            ):
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+            current.append(item)
+            current_tokens += tokens
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _analyze_clause_chunk(
+        self,
+        chunk: list[tuple],
+        context: AnalysisContext,
+    ) -> list[ClauseRisk]:
+        """Analyze a group of clauses with one request, falling back per clause"""
+        if len(chunk) == 1:
+            _, clause_id, clause_text, keyword_matches = chunk[0]
+            return [self.analyze_clause(clause_id, clause_text, context, keyword_matches)]
+        
+        prompt = self._build_multi_clause_prompt(chunk, context)
+        
+        try:
+            content = self._complete(
+                model=self.MODEL,
+                messages=[
+                    {"role": "system", "content": self._get_system_prompt()},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=min(self.MAX_TOKENS * len(chunk), self.MAX_BATCH_OUTPUT_TOKENS),
+                temperature=self.TEMPERATURE,
+                response_format={"type": "json_object"}
+            )
+            analyses = _json_loads(content)["analyses"]
+            if not isinstance(analyses, list):
+                raise ValueError("'analyses' is not a list")
+        except (ValueError, KeyError, TypeError):
+            # Malformed multi-clause output: retry each clause on its own
+            analyses = []
+        except Exception as e:
+            return [
+                self._fallback_analysis(clause_id, clause_text, keyword_matches, str(e))
+                for _, clause_id, clause_text, keyword_matches in chunk
+            ]
+        
+        by_id = {
+            str(entry.get("clause_id")): entry
+            for entry in analyses if isinstance(entry, dict)
+        }
+        
+        risks = []
+        for position, (_, clause_id, clause_text, keyword_matches) in enumerate(chunk):
+            entry = analyses[position] if position < len(analyses) else None
+            if not isinstance(entry, dict) or str(entry.get("clause_id", clause_id)) != clause_id:
+                entry = by_id.get(clause_id)
+            
+            if entry is None:
+                risks.append(self.analyze_clause(clause_id, clause_text, context, keyword_matches))
+                continue
+            
+            risk = self._parse_clause_risk(clause_id, clause_text, entry, keyword_matches)
+            self._cache.set(
+                self._cache_key(clause_text, context, keyword_matches),
+                self._copy_risk(risk, clause_id, keyword_matches),
+            )
+            risks.append(risk)
+        
+        return risks
+    
     def generate_document_summary(
         self,
         clause_risks: list[ClauseRisk],
@@ -151,7 +556,7 @@ class AIAnalyzer:
         prompt = self._build_summary_prompt(clause_risks, context)
         
         try:
-            response = self.client.chat.completions.create(
+            content = self._complete(
                 model=self.MODEL,
                 messages=[
                     {"role": "system", "content": self._get_summary_system_prompt()},
@@ -162,7 +567,7 @@ class AIAnalyzer:
                 response_format={"type": "json_object"}
             )
             
-            return json.loads(response.choices[0].message.content)
+            return _json_loads(content)
             
         except Exception as e:
             return self._fallback_summary(clause_risks, str(e))
@@ -187,7 +592,7 @@ class AIAnalyzer:
         prompt = self._build_comparison_prompt(clause_text, clause_type, industry)
         
         try:
-            response = self.client.chat.completions.create(
+            content = self._complete(
                 model=self.MODEL,
                 messages=[
                     {"role": "system", "content": "You are a market analyst with deep knowledge of standard contract terms across industries."},
@@ -198,7 +603,7 @@ class AIAnalyzer:
                 response_format={"type": "json_object"}
             )
             
-            return json.loads(response.choices[0].message.content)
+            return _json_loads(content)
             
         except Exception as e:
             return {
@@ -256,49 +661,32 @@ You must respond ONLY with valid JSON matching the requested format."""
             keywords_list = [km.keyword for km in keyword_matches]
             keywords_info = f"\nDetected keywords/phrases that triggered this analysis: {', '.join(keywords_list)}"
         
-        return f"""Analyze this contract clause for potential risks.
-
-CLAUSE:
-{clause_text}
+        return "".join((
+            _CLAUSE_PROMPT_HEADER,
+            clause_text,
+            "\n\n",
+            _context_block(context),
+            "\n",
+            keywords_info,
+            _CLAUSE_PROMPT_FOOTER,
+        ))
 
-CONTEXT:
-- Document type: {context.document_type}
-- Your client's role: {context.user_role}
-- Industry: {context.industry}
-- Jurisdiction: {context.jurisdiction}
-{f"- Contract value: ${context.contract_value:,.2f}" if context.contract_value else ""}
-{keywords_info}
-
-Respond in this EXACT JSON format:
-{{
-  "risk_category": "financial|legal_liability|termination|intellectual_property|confidentiality|dispute_resolution|compliance|operational",
-  "severity": "LOW|MEDIUM|HIGH|CRITICAL",
-  "risk_score": <0-100>,
-  "confidence": <0-100>,
-  "clause_type": "<type of clause, e.g., 'liability limitation', 'indemnification', 'termination'>",
-  "primary_risk": "<One sentence describing the main danger>",
-  "detailed_explanation": "<2-3 sentences explaining WHY this is risky in plain English>",
-  "specific_concerns": [
-    "<Concern 1>",
-    "<Concern 2>"
-  ],
-  "impact_if_triggered": "<What bad thing could happen?>",
-  "likelihood": "<How likely is this to cause problems? LOW/MEDIUM/HIGH>",
-  "recommendation": "<What should the user do about this?>",
-  "alternative_language": "<Suggest better wording, or null if clause is acceptable>",
-  "red_flags": ["<flag1>", "<flag2>"],
-  "mitigating_factors": ["<factor1>", "<factor2>"],
-  "positive_elements": ["<element1>", "<element2>"],
-  "negotiation_priority": "MUST_ADDRESS|SHOULD_NEGOTIATE|NICE_TO_HAVE|ACCEPTABLE",
-  "market_comparison": "<How does this compare to typical contracts?>"
-}}
-
-Think step by step:
-1. What is this clause trying to accomplish?
-2. Who does it favor?
-3. What's the worst-case scenario?
-4. Is this standard practice or unusual?
-5. How would I advise my client?"""
+    def _build_multi_clause_prompt(
+        self,
+        chunk: list[tuple],
+        context: AnalysisContext,
+    ) -> str:
+        """Build the prompt for analyzing several clauses in one request"""
+        
+        parts = [f"Analyze each of these {len(chunk)} contract clauses for potential risks.\n"]
+        for _, clause_id, clause_text, keyword_matches in chunk:
+            parts.append(f"\nCLAUSE [{clause_id}]:\n{clause_text}")
+            if keyword_matches:
+                parts.append(f"\nDetected keywords/phrases: {', '.join(km.keyword for km in keyword_matches)}")
+            parts.append("\n")
+        parts.extend(("\n", _context_block(context), _MULTI_CLAUSE_PROMPT_FOOTER))
+        
+        return "".join(parts)
 
     def _build_summary_prompt(
         self,
@@ -387,31 +775,11 @@ Respond with:
     ) -> ClauseRisk:
         """Parse AI response into ClauseRisk object"""
         
-        # Map string category to enum
-        category_map = {
-            "financial": RiskCategory.FINANCIAL,
-            "legal_liability": RiskCategory.LEGAL_LIABILITY,
-            "termination": RiskCategory.TERMINATION,
-            "intellectual_property": RiskCategory.INTELLECTUAL_PROPERTY,
-            "confidentiality": RiskCategory.CONFIDENTIALITY,
-            "dispute_resolution": RiskCategory.DISPUTE_RESOLUTION,
-            "compliance": RiskCategory.COMPLIANCE,
-            "operational": RiskCategory.OPERATIONAL,
-        }
-        
-        category = category_map.get(
+        category = _CATEGORY_MAP.get(
             result.get("risk_category", "").lower(),
             RiskCategory.UNKNOWN
         )
-        
-        # Map string severity to enum
-        severity_map = {
-            "LOW": SeverityLevel.LOW,
-            "MEDIUM": SeverityLevel.MEDIUM,
-            "HIGH": SeverityLevel.HIGH,
-            "CRITICAL": SeverityLevel.CRITICAL,
-        }
-        severity = severity_map.get(
+        severity = _SEVERITY_MAP.get(
             result.get("severity", "MEDIUM").upper(),
             SeverityLevel.MEDIUM
         )
@@ -487,12 +855,14 @@ Respond with:
     def _fallback_summary(self, clause_risks: list[ClauseRisk], error: str) -> dict:
         """Fallback summary when AI is unavailable"""
         
-        # Calculate basic statistics
-        scores = [r.score for r in clause_risks]
-        avg_score = sum(scores) / len(scores) if scores else 50
+        # Calculate basic statistics in one vectorized pass
+        count = len(clause_risks)
+        scores = np.fromiter((r.score for r in clause_risks), dtype=np.float64, count=count)
+        severities = np.fromiter((r.severity.value for r in clause_risks), dtype="U8", count=count)
+        avg_score = float(scores.mean()) if count else 50
         
-        critical_count = sum(1 for r in clause_risks if r.severity == SeverityLevel.CRITICAL)
-        high_count = sum(1 for r in clause_risks if r.severity == SeverityLevel.HIGH)
+        critical_count = int(np.count_nonzero(severities == SeverityLevel.CRITICAL.value))
+        high_count = int(np.count_nonzero(severities == SeverityLevel.HIGH.value))
         
         if critical_count > 0:
             overall_level = "CRITICAL"
@@ -503,20 +873,23 @@ Respond with:
         else:
             overall_level = "LOW"
         
-        # Get top risks
-        top_risks = sorted(clause_risks, key=lambda r: r.score, reverse=True)[:5]
+        # Get top risks (stable, so ties keep document order)
+        top_indices = np.argsort(-scores, kind="stable")[:5]
+        top_scores = scores[top_indices]
+        must_address = top_indices[:3][top_scores[:3] >= 70]
+        should_negotiate = top_indices[(top_scores >= 50) & (top_scores < 70)]
         
         return {
             "overall_risk_level": overall_level,
             "overall_score": int(avg_score),
             "executive_summary": f"AI summary unavailable ({error}). Manual review recommended. Found {critical_count} critical and {high_count} high-risk clauses.",
             "must_address_immediately": [
-                {"clause": r.clause_id, "issue": r.primary_risk, "urgency": "High score detected"}
-                for r in top_risks[:3] if r.score >= 70
+                {"clause": clause_risks[i].clause_id, "issue": clause_risks[i].primary_risk, "urgency": "High score detected"}
+                for i in must_address
             ],
-            "should_negotiate": [r.clause_id for r in top_risks if 50 <= r.score < 70],
-            "acceptable_as_is": [r.clause_id for r in clause_risks if r.score < 30],
-            "deal_breakers": [r.clause_id for r in clause_risks if r.score >= 90],
+            "should_negotiate": [clause_risks[i].clause_id for i in should_negotiate],
+            "acceptable_as_is": [clause_risks[i].clause_id for i in np.flatnonzero(scores < 30)],
+            "deal_breakers": [clause_risks[i].clause_id for i in np.flatnonzero(scores >= 90)],
             "overall_favorability": "unknown",
             "comparison_to_market": "Unable to determine without AI analysis",
             "action_plan": [
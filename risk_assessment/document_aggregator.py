@@ -5,10 +5,15 @@ Layer 3 of the risk assessment system.
 Combines all clause-level risks into document-level metrics and summaries.
 """
 
-from collections import defaultdict
-from dataclasses import dataclass
+import heapq
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Optional
+from operator import attrgetter
+from typing import Literal, Optional
+
+import numpy as np
 
 from .models import (
     RiskCategory,
@@ -24,9 +29,10 @@ from .models import (
     Recommendation,
 )
 from .risk_scorer import RiskScorer
+from ._agg_kernels import scan_scores
 
 
-@dataclass
+@dataclass(slots=True)
 class PatternAnalysis:
     """Analysis of patterns across the document"""
     patterns: list[str]
@@ -36,6 +42,98 @@ class PatternAnalysis:
     mutual_count: int
 
 
+# Integer codes for the enums, used to vectorize per-clause statistics
+_SEVERITIES = tuple(SeverityLevel)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+_CATEGORIES = tuple(RiskCategory)
+_CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+_CRITICAL_CODE = _SEVERITY_CODES[SeverityLevel.CRITICAL]
+_HIGH_CODE = _SEVERITY_CODES[SeverityLevel.HIGH]
+_LOW_CODE = _SEVERITY_CODES[SeverityLevel.LOW]
+
+# Negotiation talking points by category
+_TALKING_POINTS = {
+    RiskCategory.FINANCIAL: "Industry standard is to cap financial exposure at 1-2x annual contract value.",
+    RiskCategory.LEGAL_LIABILITY: "We need to ensure liability is proportionate and mutual.",
+    RiskCategory.TERMINATION: "We require reasonable termination rights for operational flexibility.",
+    RiskCategory.INTELLECTUAL_PROPERTY: "We need to retain ownership of our core IP and pre-existing materials.",
+    RiskCategory.CONFIDENTIALITY: "Confidentiality obligations should be mutual and time-limited.",
+    RiskCategory.DISPUTE_RESOLUTION: "We prefer mediation before arbitration, with a neutral venue.",
+    RiskCategory.COMPLIANCE: "Compliance obligations should be clearly defined with reasonable scope.",
+    RiskCategory.OPERATIONAL: "We need reasonable flexibility in operational terms.",
+}
+_DEFAULT_TALKING_POINT = "This clause requires revision to be more balanced."
+
+# Urgency of an action item by clause severity
+_URGENCY_BY_SEVERITY = {
+    SeverityLevel.CRITICAL: "MUST address before signing - potential deal-breaker",
+    SeverityLevel.HIGH: "Should negotiate before signing",
+    SeverityLevel.MEDIUM: "Worth discussing but not critical",
+    SeverityLevel.LOW: "Low priority - standard clause",
+}
+
+# Overall recommendation by document risk level
+_RECOMMENDATION_BY_LEVEL = {
+    SeverityLevel.CRITICAL: "DO NOT SIGN without significant negotiation. Multiple critical issues detected.",
+    SeverityLevel.HIGH: "Review high-risk clauses carefully before signing. Negotiation strongly recommended.",
+    SeverityLevel.MEDIUM: "Generally acceptable with some concerns. Consider negotiating key points.",
+    SeverityLevel.LOW: "Contract appears balanced. Standard terms with minimal risk.",
+}
+
+# Opening sentence of the executive summary by document risk level
+_OVERALL_ASSESSMENT = {
+    SeverityLevel.CRITICAL: "⚠️ This contract contains CRITICAL risks that require immediate attention.",
+    SeverityLevel.HIGH: "This contract has significant risks that should be addressed before signing.",
+    SeverityLevel.MEDIUM: "This contract has some areas of concern but is generally reasonable.",
+    SeverityLevel.LOW: "This contract appears balanced with minimal risk.",
+}
+
+# Markdown report badge by risk level value
+_LEVEL_EMOJI = {"LOW": "✅", "MEDIUM": "⚠️", "HIGH": "🔶", "CRITICAL": "🚨"}
+
+# Sort key for clause risks, top risks and recommendations
+_score_key = attrgetter("score")
+
+# Most clauses considered for top_risks / must_address_immediately
+_TOP_RISKS_LIMIT = 10
+_MUST_ADDRESS_LIMIT = 5
+
+# Red flags / mitigating factors that mark one-sided vs mutual language
+_ONE_SIDED_FLAGS = frozenset({"one-sided", "unilateral", "sole discretion"})
+_MUTUAL_FACTORS = frozenset({"mutual", "reciprocal", "balanced"})
+
+
+@dataclass
+class _ClauseScan:
+    """
+    Per-document statistics over the clause risks.
+    
+    Category dicts are keyed in order of first appearance in the document.
+    """
+    count: int = 0
+    scores: list[int] = field(default_factory=list)
+    score_sum: float = 0
+    severity_counts: dict[SeverityLevel, int] = field(default_factory=dict)
+    critical: list[ClauseRisk] = field(default_factory=list)
+    should_negotiate: list[str] = field(default_factory=list)
+    acceptable: list[str] = field(default_factory=list)
+    deal_breakers: list[str] = field(default_factory=list)
+    category_counts: Counter[RiskCategory] = field(default_factory=Counter)
+    category_sums: dict[RiskCategory, float] = field(default_factory=dict)
+    category_max: dict[RiskCategory, int] = field(default_factory=dict)
+    category_min: dict[RiskCategory, int] = field(default_factory=dict)
+    category_clauses: dict[RiskCategory, list[str]] = field(default_factory=dict)
+    high_risk_category_counts: Counter[RiskCategory] = field(default_factory=Counter)
+    one_sided_count: int = 0
+    mutual_count: int = 0
+
+
+def _first_seen(codes: np.ndarray) -> list[int]:
+    """Distinct codes in order of first appearance"""
+    unique, first_index = np.unique(codes, return_index=True)
+    return unique[np.argsort(first_index)].tolist()
+
+
 class DocumentAggregator:
     """
     Aggregates clause-level risks into document-level insights.
@@ -58,6 +156,7 @@ class DocumentAggregator:
         pages: int = 0,
         processing_time: float = 0.0,
         ai_summary: Optional[dict] = None,
+        analysis_level: Literal["summary", "full"] = "full",
     ) -> DocumentRisk:
         """
         Aggregate clause risks into a complete document risk assessment.
@@ -68,36 +167,108 @@ class DocumentAggregator:
             pages: Number of pages in document
             processing_time: Total processing time in seconds
             ai_summary: Optional AI-generated summary
+            analysis_level: "full" for the complete assessment, or "summary"
+                to fill only metadata, risk_summary, top_risks and
+                executive_summary (other fields are left empty)
             
         Returns:
             Complete DocumentRisk assessment
         """
+        if analysis_level not in ("summary", "full"):
+            raise ValueError(f"Unknown analysis_level: {analysis_level!r}")
+        
         if not clause_risks:
             return self._empty_document_risk(filename, pages, processing_time)
         
+        if analysis_level == "summary":
+            return self._build_summary_document_risk(
+                clause_risks, filename, pages, processing_time, ai_summary
+            )
+        
+        # Gather all per-clause statistics in one pass
+        scan = self._scan(clause_risks)
+        
+        # Sort once by score (stable: ties stay in document order) and share
+        # the view between top risks and must-address items
+        by_score = sorted(clause_risks, key=_score_key, reverse=True)
+        critical = SeverityLevel.CRITICAL
+        highest_critical = [r for r in by_score if r.severity == critical][:_MUST_ADDRESS_LIMIT]
+        
+        return self._build_document_risk(
+            clause_risks,
+            scan,
+            by_score[:_TOP_RISKS_LIMIT],
+            highest_critical,
+            filename, pages, processing_time, ai_summary,
+        )
+    
+    def aggregate_batch(
+        self,
+        jobs: list[tuple],
+        max_workers: Optional[int] = None,
+    ) -> list[DocumentRisk]:
+        """
+        Aggregate several documents in parallel worker processes.
+        
+        Args:
+            jobs: One tuple of aggregate() arguments per document:
+                (clause_risks, filename, pages, processing_time[, ai_summary])
+            max_workers: Worker processes (default: one per CPU)
+            
+        Returns:
+            DocumentRisk for each job, in input order
+        """
+        if len(jobs) <= 1 or max_workers == 1:
+            return [self.aggregate(*job) for job in jobs]
+        
+        # Each worker builds its own aggregator around a copy of this
+        # scorer, so documents are aggregated with the same configuration
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(self.risk_scorer,),
+        ) as executor:
+            return list(executor.map(_aggregate_job, jobs))
+    
+    def _build_document_risk(
+        self,
+        clause_risks: list[ClauseRisk],
+        scan: _ClauseScan,
+        highest: list[ClauseRisk],
+        highest_critical: list[ClauseRisk],
+        filename: str,
+        pages: int,
+        processing_time: float,
+        ai_summary: Optional[dict],
+    ) -> DocumentRisk:
+        """
+        Assemble a DocumentRisk from precomputed statistics.
+        
+        Shared by aggregate() and IncrementalAggregator.finalize(), so both
+        produce the same result for the same clauses. ``highest`` and
+        ``highest_critical`` are the top clauses (all / critical only) by
+        score, descending, ties in document order.
+        """
         # Create metadata
         metadata = DocumentMetadata(
             filename=filename,
             pages=pages,
-            clauses_analyzed=len(clause_risks),
+            clauses_analyzed=scan.count,
             analysis_timestamp=datetime.now(),
             processing_time_seconds=processing_time,
         )
         
         # Calculate risk summary
-        risk_summary = self._calculate_risk_summary(clause_risks)
+        risk_summary = self._calculate_risk_summary(clause_risks, scan)
         
         # Get top risks
-        top_risks = self._get_top_risks(clause_risks)
+        top_risks = self._top_risks_from(highest)
         
         # Calculate category summaries
-        category_summaries = self._calculate_category_summaries(clause_risks)
-        
-        # Generate action items
-        action_items = self._generate_action_items(clause_risks)
+        category_summaries = self._calculate_category_summaries(clause_risks, scan)
         
         # Analyze patterns
-        pattern_analysis = self._analyze_patterns(clause_risks)
+        pattern_analysis = self._analyze_patterns(clause_risks, scan)
         
         # Generate lists
         must_address = [
@@ -108,27 +279,12 @@ class DocumentAggregator:
                 urgency="Critical risk requiring immediate attention",
                 action=risk.recommendation,
             )
-            for i, risk in enumerate(sorted(
-                [r for r in clause_risks if r.severity == SeverityLevel.CRITICAL],
-                key=lambda x: x.score,
-                reverse=True
-            )[:5])
+            for i, risk in enumerate(highest_critical)
         ]
         
-        should_negotiate = [
-            r.clause_id for r in clause_risks
-            if r.severity == SeverityLevel.HIGH
-        ]
-        
-        acceptable = [
-            r.clause_id for r in clause_risks
-            if r.severity == SeverityLevel.LOW and r.score < 25
-        ]
-        
-        deal_breakers = [
-            r.clause_id for r in clause_risks
-            if r.score >= 90
-        ]
+        should_negotiate = scan.should_negotiate
+        acceptable = scan.acceptable
+        deal_breakers = scan.deal_breakers
         
         # Generate executive summary
         executive_summary = self._generate_executive_summary(
@@ -136,14 +292,15 @@ class DocumentAggregator:
         )
         
         # Determine overall favorability
-        favorability = self._determine_favorability(clause_risks, pattern_analysis)
+        favorability = self._determine_favorability(clause_risks, pattern_analysis, scan)
         
         # Market comparison
-        comparison = self._generate_market_comparison(clause_risks, ai_summary)
+        comparison = self._generate_market_comparison(clause_risks, ai_summary, scan)
         
         # Action plan
         action_plan = self._generate_action_plan(
-            clause_risks, top_risks, must_address, should_negotiate
+            clause_risks, top_risks, must_address, should_negotiate,
+            high_risk_categories=list(scan.high_risk_category_counts),
         )
         
         return DocumentRisk(
@@ -162,22 +319,154 @@ class DocumentAggregator:
             action_plan=action_plan,
         )
     
-    def _calculate_risk_summary(self, clause_risks: list[ClauseRisk]) -> RiskSummary:
+    def _build_summary_document_risk(
+        self,
+        clause_risks: list[ClauseRisk],
+        filename: str,
+        pages: int,
+        processing_time: float,
+        ai_summary: Optional[dict],
+    ) -> DocumentRisk:
+        """
+        Summary-level assessment: skips category summaries, buckets,
+        must-address items, market comparison and the action plan.
+        """
+        scan = self._scan(clause_risks, buckets=False)
+        risk_summary = self._calculate_risk_summary(clause_risks, scan)
+        
+        # Pattern analysis only reads the scan counters; it is kept so the
+        # executive summary reads the same as in a full assessment
+        pattern_analysis = self._analyze_patterns(clause_risks, scan)
+        
+        return DocumentRisk(
+            metadata=DocumentMetadata(
+                filename=filename,
+                pages=pages,
+                clauses_analyzed=scan.count,
+                analysis_timestamp=datetime.now(),
+                processing_time_seconds=processing_time,
+            ),
+            risk_summary=risk_summary,
+            executive_summary=self._generate_executive_summary(
+                clause_risks, risk_summary, pattern_analysis, ai_summary
+            ),
+            clause_risks=clause_risks,
+            top_risks=self._get_top_risks(clause_risks, _TOP_RISKS_LIMIT),
+            category_summaries={},
+            must_address_immediately=[],
+            should_negotiate=[],
+            acceptable_as_is=[],
+            deal_breakers=[],
+            comparison_to_market="",
+            overall_favorability="",
+            action_plan=[],
+        )
+    
+    def _scan(self, clause_risks: list[ClauseRisk], buckets: bool = True) -> _ClauseScan:
+        """
+        Collect everything the summary, category, pattern and bucket
+        builders need. Scores, severities and categories are pulled into
+        arrays once and reduced in a single kernel (see _agg_kernels).
+        With buckets=False the per-severity clause lists are not built.
+        """
+        scan = _ClauseScan()
+        count = len(clause_risks)
+        if not count:
+            return scan
+        
+        scan.count = count
+        scan.scores = [r.score for r in clause_risks]
+        ids = [r.clause_id for r in clause_risks]
+        
+        # Keep the scores' own dtype (int for normal clauses) so reductions
+        # return the same values the Python builtins would
+        scores = np.array(scan.scores)
+        severities = np.fromiter(
+            (_SEVERITY_CODES[r.severity] for r in clause_risks), dtype=np.int8, count=count
+        )
+        categories = np.fromiter(
+            (_CATEGORY_CODES[r.category] for r in clause_risks), dtype=np.int8, count=count
+        )
+        
+        # Sum, severity counts and per-category count / sum / max / min in
+        # one fused pass (Numba-compiled when installed)
+        n_categories = len(_CATEGORIES)
+        score_sum, severity_counts, cat_counts, cat_sums, cat_max, cat_min = scan_scores(
+            scores, severities, categories, len(_SEVERITIES), n_categories
+        )
+        scan.score_sum = score_sum
+        severity_counts = severity_counts.tolist()
+        scan.severity_counts = {
+            severity: severity_counts[code] for code, severity in enumerate(_SEVERITIES)
+        }
+        
+        # Buckets
+        if buckets:
+            critical = severities == _CRITICAL_CODE
+            high = severities == _HIGH_CODE
+            low = severities == _LOW_CODE
+            scan.critical = [clause_risks[i] for i in np.flatnonzero(critical)]
+            scan.should_negotiate = [ids[i] for i in np.flatnonzero(high)]
+            scan.acceptable = [ids[i] for i in np.flatnonzero(low & (scores < 25))]
+            scan.deal_breakers = [ids[i] for i in np.flatnonzero(scores >= 90)]
+        
+        # Clause ids grouped by category, document order within each group
+        by_category = np.argsort(categories, kind="stable")
+        group_end = np.cumsum(cat_counts)
+        
+        for code in _first_seen(categories):
+            category = _CATEGORIES[code]
+            scan.category_counts[category] = int(cat_counts[code])
+            scan.category_sums[category] = cat_sums[code].item()
+            scan.category_max[category] = cat_max[code].item()
+            scan.category_min[category] = cat_min[code].item()
+            group = by_category[group_end[code] - cat_counts[code]:group_end[code]]
+            scan.category_clauses[category] = [ids[i] for i in group]
+        
+        high_risk = categories[scores >= 60]
+        if high_risk.size:
+            high_risk_counts = np.bincount(high_risk, minlength=n_categories)
+            scan.high_risk_category_counts = Counter({
+                _CATEGORIES[code]: int(high_risk_counts[code]) for code in _first_seen(high_risk)
+            })
+        
+        # One hashed pass per clause instead of a list scan per marker
+        scan.one_sided_count = sum(
+            1 for r in clause_risks if not _ONE_SIDED_FLAGS.isdisjoint(r.red_flags)
+        )
+        scan.mutual_count = sum(
+            1 for r in clause_risks if not _MUTUAL_FACTORS.isdisjoint(r.mitigating_factors)
+        )
+        
+        return scan
+    
+    def _calculate_risk_summary(
+        self,
+        clause_risks: list[ClauseRisk],
+        scan: Optional[_ClauseScan] = None,
+    ) -> RiskSummary:
         """Calculate overall risk summary"""
-        scores = [r.score for r in clause_risks]
-        overall_score = self.risk_scorer.calculate_document_score(scores)
+        scan = scan or self._scan(clause_risks)
+        overall_score = self.risk_scorer.calculate_document_score(scan.scores)
         overall_level = SeverityLevel.from_score(overall_score)
         
+        CRIT = SeverityLevel.CRITICAL
+        HIGH = SeverityLevel.HIGH
+        MED = SeverityLevel.MEDIUM
+        LOW = SeverityLevel.LOW
+        n = scan.count
+        
         # Count by severity
+        counts = scan.severity_counts
         distribution = RiskDistribution(
-            critical=sum(1 for r in clause_risks if r.severity == SeverityLevel.CRITICAL),
-            high=sum(1 for r in clause_risks if r.severity == SeverityLevel.HIGH),
-            medium=sum(1 for r in clause_risks if r.severity == SeverityLevel.MEDIUM),
-            low=sum(1 for r in clause_risks if r.severity == SeverityLevel.LOW),
+            critical=counts.get(CRIT, 0),
+            high=counts.get(HIGH, 0),
+            medium=counts.get(MED, 0),
+            low=counts.get(LOW, 0),
         )
         
         # Determine favorability
-        high_risk_ratio = (distribution.critical + distribution.high) / len(clause_risks)
+        high_risk_ratio = (distribution.critical + distribution.high) / n
         if high_risk_ratio > 0.5:
             favorability = "heavily_favors_other_party"
         elif high_risk_ratio > 0.3:
@@ -188,14 +477,7 @@ class DocumentAggregator:
             favorability = "favorable"
         
         # Generate recommendation
-        if overall_level == SeverityLevel.CRITICAL:
-            recommendation = "DO NOT SIGN without significant negotiation. Multiple critical issues detected."
-        elif overall_level == SeverityLevel.HIGH:
-            recommendation = "Review high-risk clauses carefully before signing. Negotiation strongly recommended."
-        elif overall_level == SeverityLevel.MEDIUM:
-            recommendation = "Generally acceptable with some concerns. Consider negotiating key points."
-        else:
-            recommendation = "Contract appears balanced. Standard terms with minimal risk."
+        recommendation = _RECOMMENDATION_BY_LEVEL[overall_level]
         
         return RiskSummary(
             overall_score=overall_score,
@@ -207,8 +489,11 @@ class DocumentAggregator:
     
     def _get_top_risks(self, clause_risks: list[ClauseRisk], limit: int = 10) -> list[TopRisk]:
         """Get the top risks sorted by score"""
-        sorted_risks = sorted(clause_risks, key=lambda r: r.score, reverse=True)
-        
+        # nlargest keeps the same tie order as a stable descending sort
+        return self._top_risks_from(heapq.nlargest(limit, clause_risks, key=_score_key))
+    
+    def _top_risks_from(self, sorted_risks: list[ClauseRisk]) -> list[TopRisk]:
+        """Build TopRisk entries from clauses already sorted by score"""
         return [
             TopRisk(
                 rank=i + 1,
@@ -218,31 +503,27 @@ class DocumentAggregator:
                 issue=risk.primary_risk,
                 action=risk.recommendation,
             )
-            for i, risk in enumerate(sorted_risks[:limit])
+            for i, risk in enumerate(sorted_risks)
             if risk.score >= 30  # Only include medium+ risk
         ]
     
     def _calculate_category_summaries(
         self,
-        clause_risks: list[ClauseRisk]
+        clause_risks: list[ClauseRisk],
+        scan: Optional[_ClauseScan] = None,
     ) -> dict[RiskCategory, CategorySummary]:
         """Calculate summary for each risk category"""
-        category_data = defaultdict(lambda: {"scores": [], "clauses": []})
-        
-        for risk in clause_risks:
-            category_data[risk.category]["scores"].append(risk.score)
-            category_data[risk.category]["clauses"].append(risk.clause_id)
+        scan = scan or self._scan(clause_risks)
         
         summaries = {}
-        for category, data in category_data.items():
-            if data["scores"]:
-                summaries[category] = CategorySummary(
-                    category=category,
-                    count=len(data["scores"]),
-                    average_score=sum(data["scores"]) / len(data["scores"]),
-                    highest_score=max(data["scores"]),
-                    clauses=data["clauses"],
-                )
+        for category, count in scan.category_counts.items():
+            summaries[category] = CategorySummary(
+                category=category,
+                count=count,
+                average_score=scan.category_sums[category] / count,
+                highest_score=scan.category_max[category],
+                clauses=scan.category_clauses[category],
+            )
         
         return summaries
     
@@ -250,92 +531,66 @@ class DocumentAggregator:
         """Generate prioritized action items"""
         action_items = []
         
-        # Sort by score descending
-        sorted_risks = sorted(clause_risks, key=lambda r: r.score, reverse=True)
+        # Only include medium+ risk. Filtering before the sort keeps priorities
+        # unchanged: the kept clauses are exactly the head of the sorted list.
+        sorted_risks = sorted(
+            (r for r in clause_risks if r.score >= 30),
+            key=_score_key,
+            reverse=True,
+        )
         
         for i, risk in enumerate(sorted_risks):
-            if risk.score >= 30:  # Only include medium+ risk
-                urgency = self._determine_urgency(risk)
-                talking_point = self._generate_talking_point(risk)
-                
-                action_items.append(ActionItem(
-                    priority=i + 1,
-                    clause_reference=risk.clause_id,
-                    issue=risk.primary_risk,
-                    urgency=urgency,
-                    action=risk.recommendation,
-                    talking_point=talking_point,
-                ))
+            urgency = self._determine_urgency(risk)
+            talking_point = self._generate_talking_point(risk)
+            
+            action_items.append(ActionItem(
+                priority=i + 1,
+                clause_reference=risk.clause_id,
+                issue=risk.primary_risk,
+                urgency=urgency,
+                action=risk.recommendation,
+                talking_point=talking_point,
+            ))
         
         return action_items
     
     def _determine_urgency(self, risk: ClauseRisk) -> str:
         """Determine urgency level for a risk"""
-        if risk.severity == SeverityLevel.CRITICAL:
-            return "MUST address before signing - potential deal-breaker"
-        elif risk.severity == SeverityLevel.HIGH:
-            return "Should negotiate before signing"
-        elif risk.severity == SeverityLevel.MEDIUM:
-            return "Worth discussing but not critical"
-        else:
-            return "Low priority - standard clause"
+        return _URGENCY_BY_SEVERITY.get(risk.severity, "Low priority - standard clause")
     
     def _generate_talking_point(self, risk: ClauseRisk) -> str:
         """Generate a negotiation talking point"""
-        category_talking_points = {
-            RiskCategory.FINANCIAL: "Industry standard is to cap financial exposure at 1-2x annual contract value.",
-            RiskCategory.LEGAL_LIABILITY: "We need to ensure liability is proportionate and mutual.",
-            RiskCategory.TERMINATION: "We require reasonable termination rights for operational flexibility.",
-            RiskCategory.INTELLECTUAL_PROPERTY: "We need to retain ownership of our core IP and pre-existing materials.",
-            RiskCategory.CONFIDENTIALITY: "Confidentiality obligations should be mutual and time-limited.",
-            RiskCategory.DISPUTE_RESOLUTION: "We prefer mediation before arbitration, with a neutral venue.",
-            RiskCategory.COMPLIANCE: "Compliance obligations should be clearly defined with reasonable scope.",
-            RiskCategory.OPERATIONAL: "We need reasonable flexibility in operational terms.",
-        }
-        
-        return category_talking_points.get(
-            risk.category,
-            "This clause requires revision to be more balanced."
-        )
+        return _TALKING_POINTS.get(risk.category, _DEFAULT_TALKING_POINT)
     
-    def _analyze_patterns(self, clause_risks: list[ClauseRisk]) -> PatternAnalysis:
+    def _analyze_patterns(
+        self,
+        clause_risks: list[ClauseRisk],
+        scan: Optional[_ClauseScan] = None,
+    ) -> PatternAnalysis:
         """Analyze patterns across the document"""
+        scan = scan or self._scan(clause_risks)
         patterns = []
-        category_counts = defaultdict(int)
-        high_risk_categories = defaultdict(int)
+        category_counts = scan.category_counts
+        high_risk_categories = scan.high_risk_category_counts
         
-        for risk in clause_risks:
-            category_counts[risk.category] += 1
-            if risk.score >= 60:
-                high_risk_categories[risk.category] += 1
-        
-        # Find dominant category
+        # Find dominant category (ties go to the first seen, as with max())
         if category_counts:
-            dominant = max(category_counts.keys(), key=lambda c: category_counts[c])
+            dominant = category_counts.most_common(1)[0][0]
         else:
             dominant = RiskCategory.UNKNOWN
         
         # Detect patterns
         if high_risk_categories:
-            top_risk_category = max(
-                high_risk_categories.keys(),
-                key=lambda c: high_risk_categories[c]
-            )
-            if high_risk_categories[top_risk_category] >= 2:
+            top_risk_category, top_risk_count = high_risk_categories.most_common(1)[0]
+            if top_risk_count >= 2:
                 patterns.append(
                     f"Multiple high-risk {top_risk_category.value} clauses detected - "
                     f"contract may be unfavorable in this area"
                 )
         
         # Check for one-sided vs mutual language
-        one_sided_count = sum(
-            1 for r in clause_risks
-            if any(flag in r.red_flags for flag in ["one-sided", "unilateral", "sole discretion"])
-        )
-        mutual_count = sum(
-            1 for r in clause_risks
-            if any(factor in r.mitigating_factors for factor in ["mutual", "reciprocal", "balanced"])
-        )
+        one_sided_count = scan.one_sided_count
+        mutual_count = scan.mutual_count
         
         if one_sided_count > mutual_count * 2:
             patterns.append("Contract language is predominantly one-sided")
@@ -350,13 +605,13 @@ class DocumentAggregator:
             favorability = "balanced"
         
         # Check for escalating obligations
-        liability_risks = [r for r in clause_risks if r.category == RiskCategory.LEGAL_LIABILITY]
-        if len(liability_risks) >= 3 and all(r.score >= 60 for r in liability_risks):
+        liability = RiskCategory.LEGAL_LIABILITY
+        if category_counts.get(liability, 0) >= 3 and scan.category_min[liability] >= 60:
             patterns.append("All liability clauses heavily favor the other party")
         
         # Check for termination constraints
-        term_risks = [r for r in clause_risks if r.category == RiskCategory.TERMINATION]
-        if term_risks and all(r.score >= 50 for r in term_risks):
+        termination = RiskCategory.TERMINATION
+        if category_counts.get(termination, 0) and scan.category_min[termination] >= 50:
             patterns.append("Termination rights are restricted")
         
         return PatternAnalysis(
@@ -379,33 +634,14 @@ class DocumentAggregator:
             return ai_summary["executive_summary"]
         
         dist = risk_summary.distribution
-        total = dist.total
-        
-        summary_parts = []
-        
-        # Overall assessment
-        if risk_summary.overall_level == SeverityLevel.CRITICAL:
-            summary_parts.append(
-                "⚠️ This contract contains CRITICAL risks that require immediate attention."
-            )
-        elif risk_summary.overall_level == SeverityLevel.HIGH:
-            summary_parts.append(
-                "This contract has significant risks that should be addressed before signing."
-            )
-        elif risk_summary.overall_level == SeverityLevel.MEDIUM:
-            summary_parts.append(
-                "This contract has some areas of concern but is generally reasonable."
-            )
-        else:
-            summary_parts.append(
-                "This contract appears balanced with minimal risk."
-            )
         
-        # Statistics
-        summary_parts.append(
+        summary_parts = [
+            # Overall assessment
+            _OVERALL_ASSESSMENT[risk_summary.overall_level],
+            # Statistics
             f"Analysis found {dist.critical} critical, {dist.high} high, "
-            f"{dist.medium} medium, and {dist.low} low risk clauses."
-        )
+            f"{dist.medium} medium, and {dist.low} low risk clauses.",
+        ]
         
         # Patterns
         if pattern_analysis.patterns:
@@ -417,10 +653,11 @@ class DocumentAggregator:
         self,
         clause_risks: list[ClauseRisk],
         pattern_analysis: PatternAnalysis,
+        scan: Optional[_ClauseScan] = None,
     ) -> str:
         """Determine overall favorability"""
-        scores = [r.score for r in clause_risks]
-        avg_score = sum(scores) / len(scores) if scores else 0
+        scan = scan or self._scan(clause_risks)
+        avg_score = scan.score_sum / scan.count if scan.count else 0
         
         if avg_score >= 70:
             return "heavily_favors_other_party"
@@ -435,13 +672,14 @@ class DocumentAggregator:
         self,
         clause_risks: list[ClauseRisk],
         ai_summary: Optional[dict] = None,
+        scan: Optional[_ClauseScan] = None,
     ) -> str:
         """Generate market comparison text"""
         if ai_summary and "comparison_to_market" in ai_summary:
             return ai_summary["comparison_to_market"]
         
-        scores = [r.score for r in clause_risks]
-        avg_score = sum(scores) / len(scores) if scores else 0
+        scan = scan or self._scan(clause_risks)
+        avg_score = scan.score_sum / scan.count if scan.count else 0
         
         if avg_score >= 70:
             return "This contract is significantly more restrictive than typical market agreements."
@@ -458,6 +696,7 @@ class DocumentAggregator:
         top_risks: list[TopRisk],
         must_address: list[ActionItem],
         should_negotiate: list[str],
+        high_risk_categories: Optional[list[RiskCategory]] = None,
     ) -> list[str]:
         """Generate prioritized action plan"""
         action_plan = []
@@ -476,11 +715,15 @@ class DocumentAggregator:
             )
         
         # Category-specific recommendations
-        high_risk_categories = set(
-            r.category for r in clause_risks
-            if r.score >= 60
-        )
-        for category in list(high_risk_categories)[:2]:
+        # Distinct high-risk categories in document order (deterministic,
+        # unlike iterating a set of enum members, whose order follows the
+        # per-process string hash seed)
+        if high_risk_categories is None:
+            high_risk_categories = list(dict.fromkeys(
+                r.category for r in clause_risks
+                if r.score >= 60
+            ))
+        for category in high_risk_categories[:2]:
             action_plan.append(
                 f"3. Review all {category.value.replace('_', ' ')} clauses for balance"
             )
@@ -535,10 +778,11 @@ class DocumentAggregator:
         """Generate structured recommendations from document risk"""
         recommendations = []
         
-        for i, risk in enumerate(sorted(
+        # Only the top 20 can be returned, so select them with a bounded heap
+        for i, risk in enumerate(heapq.nlargest(
+            20,
             document_risk.clause_risks,
-            key=lambda r: r.score,
-            reverse=True
+            key=_score_key,
         )):
             if risk.score >= 30:  # Only include medium+ risk
                 rec = Recommendation(
@@ -556,92 +800,106 @@ class DocumentAggregator:
     
     def to_markdown_report(self, document_risk: DocumentRisk) -> str:
         """Generate a markdown-formatted risk report"""
-        lines = []
+        summary = document_risk.risk_summary
         
-        # Header
-        lines.append("# Risk Assessment Report")
-        lines.append(f"\n**Document:** {document_risk.metadata.filename}")
-        lines.append(f"**Analyzed:** {document_risk.metadata.analysis_timestamp.strftime('%Y-%m-%d %H:%M')}")
-        lines.append(f"**Clauses Analyzed:** {document_risk.metadata.clauses_analyzed}")
-        lines.append("")
+        sections = [
+            self._markdown_header(document_risk),
+            self._markdown_overall_risk(summary),
+            f"## Executive Summary\n{document_risk.executive_summary}",
+            self._markdown_distribution(summary.distribution),
+        ]
         
-        # Overall Score
-        summary = document_risk.risk_summary
-        emoji = {"LOW": "✅", "MEDIUM": "⚠️", "HIGH": "🔶", "CRITICAL": "🚨"}
-        lines.append(f"## Overall Risk: {emoji.get(summary.overall_level.value, '')} {summary.overall_level.value}")
-        lines.append(f"**Score:** {summary.overall_score}/100")
-        lines.append(f"**Recommendation:** {summary.recommendation}")
-        lines.append("")
-        
-        # Executive Summary
-        lines.append("## Executive Summary")
-        lines.append(document_risk.executive_summary)
-        lines.append("")
-        
-        # Distribution
-        lines.append("## Risk Distribution")
-        dist = summary.distribution
-        lines.append(f"- 🚨 Critical: {dist.critical}")
-        lines.append(f"- 🔶 High: {dist.high}")
-        lines.append(f"- ⚠️ Medium: {dist.medium}")
-        lines.append(f"- ✅ Low: {dist.low}")
-        lines.append("")
-        
-        # Critical Issues
         if document_risk.must_address_immediately:
-            lines.append("## 🚨 Critical Issues (Must Address)")
-            for action in document_risk.must_address_immediately:
-                lines.append(f"\n### {action.priority}. {action.clause_reference}")
-                lines.append(f"- **Issue:** {action.issue}")
-                lines.append(f"- **Action:** {action.action}")
-                if action.talking_point:
-                    lines.append(f"- **Talking Point:** {action.talking_point}")
-            lines.append("")
-        
-        # Top Risks
+            sections.append(self._markdown_critical_issues(document_risk.must_address_immediately))
+        
         if document_risk.top_risks:
-            lines.append("## ⚠️ Top Risks")
-            for risk in document_risk.top_risks[:5]:
-                lines.append(f"\n### {risk.rank}. {risk.clause_reference} (Score: {risk.score}/100)")
-                lines.append(f"- **Issue:** {risk.issue}")
-                lines.append(f"- **Action:** {risk.action}")
-            lines.append("")
-        
-        # Action Plan
-        lines.append("## 📋 Action Plan")
-        for item in document_risk.action_plan:
-            lines.append(f"- {item}")
-        lines.append("")
-        
-        # Acceptable Clauses
+            sections.append(self._markdown_top_risks(document_risk.top_risks))
+        
+        sections.append(self._markdown_action_plan(document_risk.action_plan))
+        
         if document_risk.acceptable_as_is:
-            lines.append("## ✅ Acceptable Terms")
-            lines.append(", ".join(document_risk.acceptable_as_is[:10]))
-            lines.append("")
+            sections.append(f"## ✅ Acceptable Terms\n{', '.join(document_risk.acceptable_as_is[:10])}")
         
+        return "\n\n".join(sections) + "\n"
+    
+    def _markdown_header(self, document_risk: DocumentRisk) -> str:
+        """Report title and document metadata"""
+        metadata = document_risk.metadata
+        return (
+            "# Risk Assessment Report\n"
+            f"\n**Document:** {metadata.filename}\n"
+            f"**Analyzed:** {metadata.analysis_timestamp.strftime('%Y-%m-%d %H:%M')}\n"
+            f"**Clauses Analyzed:** {metadata.clauses_analyzed}"
+        )
+    
+    def _markdown_overall_risk(self, summary: RiskSummary) -> str:
+        """Overall risk level, score and recommendation"""
+        level = summary.overall_level.value
+        return (
+            f"## Overall Risk: {_LEVEL_EMOJI.get(level, '')} {level}\n"
+            f"**Score:** {summary.overall_score}/100\n"
+            f"**Recommendation:** {summary.recommendation}"
+        )
+    
+    def _markdown_distribution(self, dist: RiskDistribution) -> str:
+        """Clause counts per severity"""
+        return (
+            "## Risk Distribution\n"
+            f"- 🚨 Critical: {dist.critical}\n"
+            f"- 🔶 High: {dist.high}\n"
+            f"- ⚠️ Medium: {dist.medium}\n"
+            f"- ✅ Low: {dist.low}"
+        )
+    
+    def _markdown_critical_issues(self, actions: list[ActionItem]) -> str:
+        """Must-address items"""
+        lines = ["## 🚨 Critical Issues (Must Address)"]
+        for action in actions:
+            lines.append(f"\n### {action.priority}. {action.clause_reference}")
+            lines.append(f"- **Issue:** {action.issue}")
+            lines.append(f"- **Action:** {action.action}")
+            if action.talking_point:
+                lines.append(f"- **Talking Point:** {action.talking_point}")
+        return "\n".join(lines)
+    
+    def _markdown_top_risks(self, top_risks: list[TopRisk]) -> str:
+        """Highest-scoring risks (up to five)"""
+        lines = ["## ⚠️ Top Risks"]
+        for risk in top_risks[:5]:
+            lines.append(f"\n### {risk.rank}. {risk.clause_reference} (Score: {risk.score}/100)")
+            lines.append(f"- **Issue:** {risk.issue}")
+            lines.append(f"- **Action:** {risk.action}")
         return "\n".join(lines)
     
+    def _markdown_action_plan(self, action_plan: list[str]) -> str:
+        """Action plan bullets"""
+        return "\n".join(["## 📋 Action Plan", *(f"- {item}" for item in action_plan)])
+    
     def to_json(self, document_risk: DocumentRisk) -> dict:
         """Convert document risk to JSON-serializable dict"""
+        meta = document_risk.metadata
+        rs = document_risk.risk_summary
+        dist = rs.distribution
+        
         return {
             "document_metadata": {
-                "filename": document_risk.metadata.filename,
-                "pages": document_risk.metadata.pages,
-                "clauses_analyzed": document_risk.metadata.clauses_analyzed,
-                "analysis_timestamp": document_risk.metadata.analysis_timestamp.isoformat(),
-                "processing_time_seconds": document_risk.metadata.processing_time_seconds,
+                "filename": meta.filename,
+                "pages": meta.pages,
+                "clauses_analyzed": meta.clauses_analyzed,
+                "analysis_timestamp": meta.analysis_timestamp.isoformat(),
+                "processing_time_seconds": meta.processing_time_seconds,
             },
             "risk_summary": {
-                "overall_score": document_risk.risk_summary.overall_score,
-                "overall_level": document_risk.risk_summary.overall_level.value,
+                "overall_score": rs.overall_score,
+                "overall_level": rs.overall_level.value,
                 "distribution": {
-                    "critical": document_risk.risk_summary.distribution.critical,
-                    "high": document_risk.risk_summary.distribution.high,
-                    "medium": document_risk.risk_summary.distribution.medium,
-                    "low": document_risk.risk_summary.distribution.low,
+                    "critical": dist.critical,
+                    "high": dist.high,
+                    "medium": dist.medium,
+                    "low": dist.low,
                 },
-                "favorability": document_risk.risk_summary.favorability,
-                "recommendation": document_risk.risk_summary.recommendation,
+                "favorability": rs.favorability,
+                "recommendation": rs.recommendation,
             },
             "executive_summary": document_risk.executive_summary,
             "top_risks": [
@@ -657,11 +915,11 @@ class DocumentAggregator:
             ],
             "categories": {
                 cat.value: {
-                    "count": summary.count,
-                    "avg_score": round(summary.average_score, 1),
-                    "highest": summary.highest_score,
+                    "count": cs.count,
+                    "avg_score": round(cs.average_score, 1),
+                    "highest": cs.highest_score,
                 }
-                for cat, summary in document_risk.category_summaries.items()
+                for cat, cs in document_risk.category_summaries.items()
             },
             "must_address_immediately": [
                 {
@@ -680,3 +938,139 @@ class DocumentAggregator:
             "comparison_to_market": document_risk.comparison_to_market,
             "action_plan": document_risk.action_plan,
         }
+
+
+class IncrementalAggregator:
+    """
+    Streaming counterpart of DocumentAggregator.aggregate().
+    
+    Clause risks are pushed one at a time as they are produced (e.g. as AI
+    results come back). Counts, sums, per-category stats and bounded top-k
+    heaps are updated on each push, so finalize() does not re-scan the
+    clauses and returns the same DocumentRisk aggregate() would.
+    
+    Usage:
+        incremental = IncrementalAggregator()
+        for risk in clause_risks:
+            incremental.push(risk)
+        document_risk = incremental.finalize("contract.pdf", pages=12)
+    """
+    
+    def __init__(self, aggregator: Optional[DocumentAggregator] = None):
+        self.aggregator = aggregator or DocumentAggregator()
+        self.clause_risks: list[ClauseRisk] = []
+        self._stats = _ClauseScan()
+        # Min-heaps of (score, -index, risk): the lowest score, latest clause
+        # is evicted first, matching the tie order of a stable sort
+        self._top: list[tuple] = []
+        self._top_critical: list[tuple] = []
+    
+    def __len__(self) -> int:
+        return self._stats.count
+    
+    def push(self, risk: ClauseRisk) -> None:
+        """Fold one clause risk into the running statistics"""
+        scan = self._stats
+        index = scan.count
+        score = risk.score
+        severity = risk.severity
+        category = risk.category
+        clause_id = risk.clause_id
+        
+        self.clause_risks.append(risk)
+        scan.count += 1
+        scan.scores.append(score)
+        scan.score_sum += score
+        scan.severity_counts[severity] = scan.severity_counts.get(severity, 0) + 1
+        
+        # Buckets
+        if severity == SeverityLevel.CRITICAL:
+            scan.critical.append(risk)
+            _push_bounded(self._top_critical, (score, -index, risk), _MUST_ADDRESS_LIMIT)
+        elif severity == SeverityLevel.HIGH:
+            scan.should_negotiate.append(clause_id)
+        elif severity == SeverityLevel.LOW and score < 25:
+            scan.acceptable.append(clause_id)
+        if score >= 90:
+            scan.deal_breakers.append(clause_id)
+        _push_bounded(self._top, (score, -index, risk), _TOP_RISKS_LIMIT)
+        
+        # Per-category count / sum / max / min
+        if category in scan.category_counts:
+            scan.category_counts[category] += 1
+            scan.category_sums[category] += score
+            if score > scan.category_max[category]:
+                scan.category_max[category] = score
+            if score < scan.category_min[category]:
+                scan.category_min[category] = score
+            scan.category_clauses[category].append(clause_id)
+        else:
+            scan.category_counts[category] = 1
+            scan.category_sums[category] = score
+            scan.category_max[category] = score
+            scan.category_min[category] = score
+            scan.category_clauses[category] = [clause_id]
+        
+        if score >= 60:
+            scan.high_risk_category_counts[category] += 1
+        
+        if not _ONE_SIDED_FLAGS.isdisjoint(risk.red_flags):
+            scan.one_sided_count += 1
+        if not _MUTUAL_FACTORS.isdisjoint(risk.mitigating_factors):
+            scan.mutual_count += 1
+    
+    def finalize(
+        self,
+        filename: str = "document",
+        pages: int = 0,
+        processing_time: float = 0.0,
+        ai_summary: Optional[dict] = None,
+    ) -> DocumentRisk:
+        """
+        Build the document risk assessment from everything pushed so far.
+        
+        Can be called more than once; pushing further clauses afterwards
+        does not change results already returned.
+        """
+        stats = self._stats
+        if not stats.count:
+            return self.aggregator._empty_document_risk(filename, pages, processing_time)
+        
+        # Snapshot the growing lists so later pushes don't leak into the result
+        snapshot = replace(
+            stats,
+            should_negotiate=list(stats.should_negotiate),
+            acceptable=list(stats.acceptable),
+            deal_breakers=list(stats.deal_breakers),
+            category_clauses={c: list(ids) for c, ids in stats.category_clauses.items()},
+        )
+        return self.aggregator._build_document_risk(
+            list(self.clause_risks),
+            snapshot,
+            [entry[2] for entry in sorted(self._top, reverse=True)],
+            [entry[2] for entry in sorted(self._top_critical, reverse=True)],
+            filename, pages, processing_time, ai_summary,
+        )
+
+
+def _push_bounded(heap: list[tuple], entry: tuple, limit: int) -> None:
+    """Keep the ``limit`` largest entries in a min-heap"""
+    if len(heap) < limit:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+# Per-process aggregator used by DocumentAggregator.aggregate_batch
+_batch_aggregator: Optional[DocumentAggregator] = None
+
+
+def _init_batch_worker(risk_scorer: RiskScorer) -> None:
+    """Process-pool initializer: build this worker's aggregator once"""
+    global _batch_aggregator
+    _batch_aggregator = DocumentAggregator(risk_scorer)
+
+
+def _aggregate_job(job: tuple) -> DocumentRisk:
+    """Aggregate one aggregate_batch() job in a worker process"""
+    return _batch_aggregator.aggregate(*job)
@@ -5,9 +5,16 @@ Layer 1 of the risk assessment system.
 Performs sub-second scanning of documents for known high-risk keywords and patterns.
 """
 
+import re
+import threading
 import time
-from dataclasses import dataclass
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict
+from typing import Optional
+
+import numpy as np
 
 from .models import (
     RiskCategory,
@@ -16,10 +23,169 @@ from .models import (
     RedFlag,
     QuickScanResult,
 )
-from .keyword_library import KeywordLibrary
+from .keyword_library import KeywordEntry, KeywordLibrary, get_keyword_library
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Characters where hyperscan's caseless / Unicode \s matching can disagree
+# with Python's re; texts containing them skip the hyperscan prefilter
+_HYPERSCAN_UNSAFE = re.compile("[\x1c-\x1f\u0130\u0131\u017f\u212a]")
+
+# ASCII controls that \s matches in str patterns but not in bytes patterns
+_ASCII_SEPARATORS = re.compile("[\x1c-\x1f]")
+
+# Keyword weight bucket boundaries and the severity of each bucket
+# (vectorized form of FastScanner._weight_to_severity)
+_SEVERITY_WEIGHT_BOUNDS = np.array([1.5, 2.0, 2.5])
+_SEVERITY_BY_BUCKET = (
+    SeverityLevel.LOW,
+    SeverityLevel.MEDIUM,
+    SeverityLevel.HIGH,
+    SeverityLevel.CRITICAL,
+)
+
+
+def _severity_buckets(weights: np.ndarray) -> np.ndarray:
+    """Index into _SEVERITY_BY_BUCKET for each keyword weight"""
+    return np.searchsorted(_SEVERITY_WEIGHT_BOUNDS, weights, side="right")
 
 
-@dataclass
+class _DangerousPatternSet:
+    """
+    Compiled form of FastScanner.DANGEROUS_PATTERNS.
+    
+    Patterns without a '.*' are joined into a single alternation (one named
+    group per pattern) and found in one pass; this is only exact because
+    their matches never overlap one another (see DANGEROUS_PATTERNS).
+    Patterns with a DOTALL '.*' can span large parts of the document and
+    would hide the other matches inside that span, so they keep their own
+    pass. With hyperscan installed, one prefilter scan first tells which
+    patterns can match at all.
+    """
+    
+    def __init__(self, patterns: tuple[str, ...]):
+        self.patterns = patterns
+        flags = re.IGNORECASE | re.DOTALL
+        joinable = [(i, pattern) for i, pattern in enumerate(patterns) if ".*" not in pattern]
+        # A leading \b shared by every branch is checked once per position;
+        # left inside each branch it makes the union slower than separate passes
+        prefix = r"\b" if all(p.startswith(r"\b") for _, p in joinable) else ""
+        self.union = re.compile(
+            prefix + "(?:" + "|".join(
+                f"(?P<p{i}>{pattern[len(prefix):]})" for i, pattern in joinable
+            ) + ")",
+            flags,
+        )
+        self.union_ids = frozenset(i for i, _ in joinable)
+        self.spanning = [
+            (i, re.compile(pattern, flags))
+            for i, pattern in enumerate(patterns)
+            if ".*" in pattern
+        ]
+        
+        # Byte-pattern twins, used for ASCII text: same matches, but the
+        # engine skips Unicode case folding and character classes
+        self.union_bytes = re.compile(self.union.pattern.encode(), flags)
+        self.spanning_bytes = [
+            (i, re.compile(pattern.pattern.encode(), flags)) for i, pattern in self.spanning
+        ]
+        
+        self.database = None
+        if HYPERSCAN_AVAILABLE:
+            self.database = self._compile_hyperscan_prefilter()
+            self._hyperscan_local = threading.local()
+    
+    def __reduce__(self):
+        # Compiled regexes, the hyperscan database and scratch space are
+        # rebuilt (or taken from the cache) in the receiving process
+        return _compile_dangerous_patterns, (self.patterns,)
+    
+    def _compile_hyperscan_prefilter(self):
+        """
+        Compile all patterns into one hyperscan database.
+        
+        Used only to tell which patterns can match a text; the matches
+        themselves still come from the re patterns. Word boundaries are
+        dropped so the database matches a superset of what re would.
+        """
+        expressions = [pattern.replace(r"\b", "").encode() for pattern in self.patterns]
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=(
+                hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_DOTALL
+                | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+                | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+            ),
+        )
+        return database
+    
+    def candidates(self, text: str, data: Optional[bytes] = None) -> Optional[set[int]]:
+        """
+        Indices of the patterns that may match, or None if unknown.
+        ``data`` is the text already encoded, when the caller has it.
+        """
+        if self.database is None:
+            return None
+        if data is None:
+            if _HYPERSCAN_UNSAFE.search(text):
+                return None
+            try:
+                data = text.encode("utf-8")
+            except UnicodeEncodeError:  # lone surrogates
+                return None
+        
+        # Scratch space is not shareable between threads
+        scratch = getattr(self._hyperscan_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hyperscan_local.scratch = hyperscan.Scratch(self.database)
+        
+        hits = set()
+        self.database.scan(
+            data,
+            match_event_handler=lambda pattern_id, start, end, flags, context: hits.add(pattern_id),
+            scratch=scratch,
+        )
+        return hits
+    
+    def find(self, text: str) -> list[tuple[int, int]]:
+        """
+        (start, end) of every match, grouped by pattern in pattern order
+        (document order within each pattern).
+        """
+        # ASCII text is matched as bytes; offsets are the same
+        if text.isascii() and not _ASCII_SEPARATORS.search(text):
+            subject = text.encode("ascii")
+            union, spanning = self.union_bytes, self.spanning_bytes
+            candidates = self.candidates(text, subject)
+        else:
+            subject = text
+            union, spanning = self.union, self.spanning
+            candidates = self.candidates(text)
+        
+        found = [[] for _ in self.patterns]
+        if candidates is None or not candidates.isdisjoint(self.union_ids):
+            for match in union.finditer(subject):
+                found[int(match.lastgroup[1:])].append(match.span())
+        for i, pattern in spanning:
+            if candidates is None or i in candidates:
+                found[i] = [match.span() for match in pattern.finditer(subject)]
+        return [span for spans in found for span in spans]
+
+
+@lru_cache(maxsize=None)
+def _compile_dangerous_patterns(patterns: tuple[str, ...]) -> _DangerousPatternSet:
+    """Compile a dangerous-pattern list once per process"""
+    return _DangerousPatternSet(patterns)
+
+
+@dataclass(slots=True)
 class ClauseScanResult:
     """Scan result for a single clause"""
     clause_id: str
@@ -58,7 +224,11 @@ class FastScanner:
         ("strict liability", RiskCategory.COMPLIANCE),
     ]
     
-    # Structural patterns that indicate high risk
+    # Structural patterns that indicate high risk.
+    # Invariant: patterns without '.*' share one alternation in
+    # _DangerousPatternSet, so a match of one must never overlap a match of
+    # another (the alternation would drop the later one). Patterns with '.*'
+    # are scanned on their own and are exempt.
     DANGEROUS_PATTERNS = [
         # One-sided language patterns
         r"\b(?:you|party\s+a|customer|licensee|user)\s+(?:shall|must|will|agrees?\s+to)\s+(?:indemnify|hold\s+harmless)",
@@ -72,24 +242,28 @@ class FastScanner:
         r"\bimmediate\s+termination\s+(?:without|with\s+no)\s+(?:cure|notice)",
     ]
     
-    def __init__(self, keyword_library: KeywordLibrary = None):
-        self.keyword_library = keyword_library or KeywordLibrary()
-        self._compile_dangerous_patterns()
+    CLAUSE_CACHE_SIZE = 4096  # Clause scans kept for re-scans of unchanged text
+    DOCUMENT_CACHE_SIZE = 8  # Document keyword searches kept (quick scan, then full analysis)
     
-    def _compile_dangerous_patterns(self):
-        """Compile dangerous patterns for efficient matching"""
-        import re
-        self._compiled_dangerous = [
-            re.compile(pattern, re.IGNORECASE | re.DOTALL)
-            for pattern in self.DANGEROUS_PATTERNS
-        ]
+    def __init__(self, keyword_library: KeywordLibrary = None):
+        self.keyword_library = keyword_library or get_keyword_library()
+        self._dangerous = _compile_dangerous_patterns(tuple(self.DANGEROUS_PATTERNS))
+        self._clause_cache: OrderedDict = OrderedDict()
+        self._clause_cache_lock = threading.Lock()
+        self._document_cache: OrderedDict = OrderedDict()
+        self._document_cache_lock = threading.Lock()
+        self._keyword_entry_index: Optional[dict] = None
     
-    def scan_document(self, text: str) -> QuickScanResult:
+    def scan_document(self, text: str, early_exit: bool = False) -> QuickScanResult:
         """
         Perform fast scan of entire document.
         
         Args:
             text: Full document text
+            early_exit: Stop scanning once a CRITICAL verdict is certain. Only
+                estimated_risk_level is then complete: the keyword search is
+                skipped when the structural patterns alone settle it, and
+                clauses_to_deep_analyze is left empty.
             
         Returns:
             QuickScanResult with detected issues
@@ -98,63 +272,72 @@ class FastScanner:
         
         keyword_matches = []
         red_flags = []
-        category_counts = defaultdict(int)
         
-        # Step 1: Scan for all keywords
-        all_matches = self.keyword_library.search_all(text)
+        # Step 1: Check for dangerous structural patterns
+        pattern_flags = []
+        for start, end in self._dangerous.find(text):
+            # Determine category based on pattern content
+            matched_text = text[start:end]
+            category = self._categorize_pattern_match(matched_text)
+            red_flag = RedFlag(
+                phrase=matched_text[:100],  # Truncate long matches
+                category=category,
+                weight=3.0,
+                position=(start, end),
+                description="Dangerous structural pattern detected",
+            )
+            pattern_flags.append(red_flag)
+        
+        # Each structural flag is critical, so three of them make the
+        # document CRITICAL whatever the keywords add
+        settled = early_exit and len(pattern_flags) >= 3
+        
+        # Step 2: Scan for all keywords
+        all_matches = {} if settled else self._search_document(text)
+        
+        get_context = self.keyword_library.get_context
+        
+        # Scoring is accumulated per keyword entry (weight x hits) rather
+        # than by walking every match again afterwards
+        total_weight = 0.0
+        critical_count = len(pattern_flags)
         
         for category, matches in all_matches.items():
             for keyword_entry, positions in matches:
+                # Per-entry fields are looked up once, not once per hit
+                keyword = keyword_entry.pattern
+                weight = keyword_entry.weight
+                is_red_flag = keyword_entry.is_red_flag  # Critical phrase
+                total_weight += weight * len(positions)
+                if weight >= 3.0:
+                    critical_count += len(positions)
+                
                 for start, end, matched_text in positions:
-                    # Get context around the match
-                    context = self.keyword_library.get_context(text, start, end)
-                    
-                    keyword_match = KeywordMatch(
-                        keyword=keyword_entry.pattern,
+                    position = (start, end)
+                    keyword_matches.append(KeywordMatch(
+                        keyword=keyword,
                         category=category,
-                        weight=keyword_entry.weight,
-                        position=(start, end),
-                        context=context,
-                    )
-                    keyword_matches.append(keyword_match)
-                    category_counts[category] += 1
+                        weight=weight,
+                        position=position,
+                        context=get_context(text, start, end),
+                    ))
                     
-                    # Check if this is a critical phrase (red flag)
-                    if keyword_entry.weight >= 2.5:
-                        red_flag = RedFlag(
+                    if is_red_flag:
+                        red_flags.append(RedFlag(
                             phrase=matched_text,
                             category=category,
-                            weight=keyword_entry.weight,
-                            position=(start, end),
+                            weight=weight,
+                            position=position,
                             description=keyword_entry.description,
-                        )
-                        red_flags.append(red_flag)
-        
-        # Step 2: Check for dangerous structural patterns
-        for pattern in self._compiled_dangerous:
-            for match in pattern.finditer(text):
-                # Determine category based on pattern content
-                category = self._categorize_pattern_match(match.group())
-                red_flag = RedFlag(
-                    phrase=match.group()[:100],  # Truncate long matches
-                    category=category,
-                    weight=3.0,
-                    position=(match.start(), match.end()),
-                    description="Dangerous structural pattern detected",
-                )
-                red_flags.append(red_flag)
-        
-        # Step 3: Check for critical phrases
-        text_lower = text.lower()
-        for phrase, category in self.CRITICAL_PHRASES:
-            if phrase.lower() in text_lower:
-                # Already counted in keyword matches, just ensure flagged
-                pass
+                        ))
         
-        # Calculate estimated risk level
-        total_weight = sum(km.weight for km in keyword_matches)
-        critical_count = len([rf for rf in red_flags if rf.weight >= 3.0])
+        # Keyword flags come first, as they always have
+        red_flags.extend(pattern_flags)
+        
+        # Per-category match counts, counted in C rather than per hit
+        category_counts = Counter(km.category for km in keyword_matches)
         
+        # Calculate estimated risk level
         if critical_count >= 3 or total_weight > 50:
             estimated_level = SeverityLevel.CRITICAL
         elif critical_count >= 1 or total_weight > 30:
@@ -165,9 +348,12 @@ class FastScanner:
             estimated_level = SeverityLevel.LOW
         
         # Identify clauses needing deep analysis
-        clauses_to_analyze = self._identify_clauses_for_deep_analysis(
-            keyword_matches, red_flags, text
-        )
+        if early_exit and estimated_level == SeverityLevel.CRITICAL:
+            clauses_to_analyze = []
+        else:
+            clauses_to_analyze = self._identify_clauses_for_deep_analysis(
+                keyword_matches, red_flags, text
+            )
         
         processing_time = (time.perf_counter() - start_time) * 1000  # ms
         
@@ -192,6 +378,166 @@ class FastScanner:
         Returns:
             ClauseScanResult with detailed clause analysis
         """
+        cached = self._get_cached_clause_scan(clause_text)
+        if cached is None:
+            cached = self._scan_clause_text(clause_text)
+            self._cache_clause_scan(clause_text, cached)
+        
+        return self._with_clause_id(cached, clause_id)
+    
+    def scan_clauses_batch(
+        self,
+        clauses: list[tuple[str, str]],
+        max_workers: Optional[int] = None,
+    ) -> list[ClauseScanResult]:
+        """
+        Scan several clauses, spreading uncached ones over worker processes.
+        
+        Args:
+            clauses: (clause_id, clause_text) pairs
+            max_workers: Worker processes (default: one per CPU)
+            
+        Returns:
+            ClauseScanResult for each clause, in input order
+        """
+        pending = [
+            clause_text
+            for clause_text in dict.fromkeys(clause_text for _, clause_text in clauses)
+            if self._get_cached_clause_scan(clause_text) is None
+        ]
+        
+        if len(pending) > 1 and max_workers != 1:
+            # Each worker unpickles its own copy of this scanner's keyword
+            # library; the dangerous patterns are recompiled once per worker
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_batch_worker,
+                initargs=(self.keyword_library,),
+            ) as executor:
+                scans = executor.map(_scan_clause_job, pending, chunksize=32)
+                for clause_text, scan in zip(pending, scans):
+                    self._cache_clause_scan(clause_text, scan)
+        
+        return [self.scan_clause(clause_id, clause_text) for clause_id, clause_text in clauses]
+    
+    def scan_from_matches(
+        self,
+        clause_id: str,
+        clause_text: str,
+        clause_start: int,
+        parent_matches: list[KeywordMatch],
+    ) -> ClauseScanResult:
+        """
+        Scan a clause of an already-scanned document without re-running
+        keyword matching.
+        
+        The document's keyword matches that lie inside the clause are reused,
+        shifted to clause positions and given clause-level context; only the
+        dangerous patterns are matched against the clause text itself. The
+        result equals scan_clause() except where a document match crosses
+        the clause boundary.
+        
+        Args:
+            clause_id: Unique identifier for the clause
+            clause_text: The clause text, as found at clause_start in the document
+            clause_start: Offset of the clause in the scanned document
+            parent_matches: keyword_matches of the document's QuickScanResult
+            
+        Returns:
+            ClauseScanResult with detailed clause analysis
+        """
+        clause_end = clause_start + len(clause_text)
+        entries = self._keyword_entries()
+        get_context = self.keyword_library.get_context
+        
+        keyword_matches = []
+        red_flags = []
+        category_scores = defaultdict(float)
+        
+        for km in parent_matches:
+            start, end = km.position
+            if start < clause_start or end > clause_end:
+                continue
+            start -= clause_start
+            end -= clause_start
+            position = (start, end)
+            keyword_matches.append(KeywordMatch(
+                keyword=km.keyword,
+                category=km.category,
+                weight=km.weight,
+                position=position,
+                context=get_context(clause_text, start, end, 50),
+            ))
+            category_scores[km.category] += km.weight
+            
+            if km.weight >= 2.5:
+                red_flags.append(RedFlag(
+                    phrase=clause_text[start:end],
+                    category=km.category,
+                    weight=km.weight,
+                    position=position,
+                    description=entries[km.category, km.keyword].description,
+                ))
+        
+        return self._finish_clause_scan(
+            clause_id, clause_text, keyword_matches, red_flags, category_scores
+        )
+    
+    def _keyword_entries(self) -> dict[tuple[RiskCategory, str], KeywordEntry]:
+        """Keyword entries of the library by (category, pattern), built on first use"""
+        if self._keyword_entry_index is None:
+            library = self.keyword_library
+            self._keyword_entry_index = {
+                (category, entry.pattern): entry
+                for category in library.get_all_categories()
+                for entry in library.get_keywords(category)
+            }
+        return self._keyword_entry_index
+    
+    def _search_document(self, text: str) -> dict:
+        """
+        keyword_library.search_all() for a document, kept for re-scans of the
+        same text. The result is shared between scans and only read.
+        """
+        with self._document_cache_lock:
+            cached = self._document_cache.get(text)
+            if cached is not None:
+                self._document_cache.move_to_end(text)
+                return cached
+        
+        all_matches = self.keyword_library.search_all(text)
+        with self._document_cache_lock:
+            self._document_cache[text] = all_matches
+            while len(self._document_cache) > self.DOCUMENT_CACHE_SIZE:
+                self._document_cache.popitem(last=False)
+        return all_matches
+    
+    def _get_cached_clause_scan(self, clause_text: str) -> Optional[ClauseScanResult]:
+        with self._clause_cache_lock:
+            cached = self._clause_cache.get(clause_text)
+            if cached is not None:
+                self._clause_cache.move_to_end(clause_text)
+            return cached
+    
+    def _cache_clause_scan(self, clause_text: str, scan: ClauseScanResult) -> None:
+        with self._clause_cache_lock:
+            self._clause_cache[clause_text] = scan
+            self._clause_cache.move_to_end(clause_text)
+            while len(self._clause_cache) > self.CLAUSE_CACHE_SIZE:
+                self._clause_cache.popitem(last=False)
+    
+    def _with_clause_id(self, cached: ClauseScanResult, clause_id: str) -> ClauseScanResult:
+        """Copy of a cached scan with fresh containers, so callers can't alter the cache"""
+        return replace(
+            cached,
+            clause_id=clause_id,
+            keyword_matches=list(cached.keyword_matches),
+            red_flags=list(cached.red_flags),
+            category_scores=dict(cached.category_scores),
+        )
+    
+    def _scan_clause_text(self, clause_text: str) -> ClauseScanResult:
+        """Uncached body of scan_clause (the returned clause_id is empty)"""
         keyword_matches = []
         red_flags = []
         category_scores = defaultdict(float)
@@ -199,44 +545,58 @@ class FastScanner:
         # Search for keywords
         all_matches = self.keyword_library.search_all(clause_text)
         
+        get_context = self.keyword_library.get_context
+        
         for category, matches in all_matches.items():
             for keyword_entry, positions in matches:
+                keyword = keyword_entry.pattern
+                weight = keyword_entry.weight
+                is_red_flag = keyword_entry.is_red_flag
+                category_scores[category] += weight * len(positions)
+                
                 for start, end, matched_text in positions:
-                    context = self.keyword_library.get_context(clause_text, start, end, 50)
-                    
-                    keyword_match = KeywordMatch(
-                        keyword=keyword_entry.pattern,
+                    position = (start, end)
+                    keyword_matches.append(KeywordMatch(
+                        keyword=keyword,
                         category=category,
-                        weight=keyword_entry.weight,
-                        position=(start, end),
-                        context=context,
-                    )
-                    keyword_matches.append(keyword_match)
-                    category_scores[category] += keyword_entry.weight
+                        weight=weight,
+                        position=position,
+                        context=get_context(clause_text, start, end, 50),
+                    ))
                     
-                    if keyword_entry.weight >= 2.5:
-                        red_flag = RedFlag(
+                    if is_red_flag:
+                        red_flags.append(RedFlag(
                             phrase=matched_text,
                             category=category,
-                            weight=keyword_entry.weight,
-                            position=(start, end),
+                            weight=weight,
+                            position=position,
                             description=keyword_entry.description,
-                        )
-                        red_flags.append(red_flag)
+                        ))
         
+        return self._finish_clause_scan("", clause_text, keyword_matches, red_flags, category_scores)
+    
+    def _finish_clause_scan(
+        self,
+        clause_id: str,
+        clause_text: str,
+        keyword_matches: list[KeywordMatch],
+        red_flags: list[RedFlag],
+        category_scores: defaultdict,
+    ) -> ClauseScanResult:
+        """Add dangerous-pattern flags to a clause's keyword results and grade it"""
         # Check dangerous patterns
-        for pattern in self._compiled_dangerous:
-            for match in pattern.finditer(clause_text):
-                category = self._categorize_pattern_match(match.group())
-                red_flag = RedFlag(
-                    phrase=match.group()[:100],
-                    category=category,
-                    weight=3.0,
-                    position=(match.start(), match.end()),
-                    description="Dangerous structural pattern",
-                )
-                red_flags.append(red_flag)
-                category_scores[category] += 3.0
+        for start, end in self._dangerous.find(clause_text):
+            matched_text = clause_text[start:end]
+            category = self._categorize_pattern_match(matched_text)
+            red_flag = RedFlag(
+                phrase=matched_text[:100],
+                category=category,
+                weight=3.0,
+                position=(start, end),
+                description="Dangerous structural pattern",
+            )
+            red_flags.append(red_flag)
+            category_scores[category] += 3.0
         
         # Calculate clause severity
         total_weight = sum(category_scores.values())
@@ -291,27 +651,40 @@ class FastScanner:
         Returns list of text segments or clause identifiers.
         """
         # Group matches by approximate location (paragraph boundaries)
-        paragraphs = full_text.split('\n\n')
         clauses_to_analyze = []
         
-        char_position = 0
-        for i, para in enumerate(paragraphs):
-            para_start = char_position
-            para_end = char_position + len(para)
+        # Match start offsets in order; paragraphs are visited in order too,
+        # so one pointer sweeps both lists
+        positions = sorted(
+            [km.position[0] for km in keyword_matches]
+            + [rf.position[0] for rf in red_flags]
+        )
+        n_positions = len(positions)
+        next_position = 0
+        
+        # Walk the same paragraphs as full_text.split('\n\n') by offset,
+        # slicing only the paragraphs that contain a match
+        text_len = len(full_text)
+        para_start = 0
+        i = 0
+        while True:
+            para_end = full_text.find('\n\n', para_start)
+            if para_end == -1:
+                para_end = text_len
             
             # Check if any matches fall in this paragraph
-            has_match = any(
-                para_start <= km.position[0] < para_end
-                for km in keyword_matches
-            ) or any(
-                para_start <= rf.position[0] < para_end
-                for rf in red_flags
-            )
+            while next_position < n_positions and positions[next_position] < para_start:
+                next_position += 1
+            has_match = next_position < n_positions and positions[next_position] < para_end
             
-            if has_match and len(para.strip()) > 20:  # Skip very short paragraphs
+            # Skip very short paragraphs
+            if has_match and len(full_text[para_start:para_end].strip()) > 20:
                 clauses_to_analyze.append(f"paragraph_{i}")
             
-            char_position = para_end + 2  # Account for \n\n
+            if para_end == text_len:
+                break
+            para_start = para_end + 2  # Account for \n\n
+            i += 1
         
         return clauses_to_analyze
     
@@ -321,28 +694,36 @@ class FastScanner:
         
         Returns list of dicts with position, severity, and category info.
         """
-        heatmap_data = []
+        keyword_matches = scan_result.keyword_matches
+        
+        # Severity and red-flag status for all keyword matches at once
+        weights = np.fromiter(
+            (km.weight for km in keyword_matches), dtype=np.float64, count=len(keyword_matches)
+        )
+        severities = [_SEVERITY_BY_BUCKET[b].value for b in _severity_buckets(weights).tolist()]
+        is_red_flag = (weights >= 2.5).tolist()
         
         # Process all keyword matches
-        for km in scan_result.keyword_matches:
-            heatmap_data.append({
+        heatmap_data = [
+            {
                 'start': km.position[0],
                 'end': km.position[1],
                 'category': km.category.value,
-                'severity': self._weight_to_severity(km.weight).value,
+                'severity': severity,
                 'weight': km.weight,
                 'keyword': km.keyword,
-                'is_red_flag': km.weight >= 2.5,
-            })
+                'is_red_flag': red_flag,
+            }
+            for km, severity, red_flag in zip(keyword_matches, severities, is_red_flag)
+        ]
         
         # Add red flag positions
+        added = {(h['start'], h['end']) for h in heatmap_data}
         for rf in scan_result.red_flags:
-            # Check if already added via keyword match
-            already_added = any(
-                h['start'] == rf.position[0] and h['end'] == rf.position[1]
-                for h in heatmap_data
-            )
-            if not already_added:
+            # Check if already added via keyword match (or an earlier red flag)
+            span = (rf.position[0], rf.position[1])
+            if span not in added:
+                added.add(span)
                 heatmap_data.append({
                     'start': rf.position[0],
                     'end': rf.position[1],
@@ -371,10 +752,19 @@ class FastScanner:
     
     def get_summary_stats(self, scan_result: QuickScanResult) -> dict:
         """Generate summary statistics from scan result"""
-        severity_counts = defaultdict(int)
-        for km in scan_result.keyword_matches:
-            severity = self._weight_to_severity(km.weight)
-            severity_counts[severity.value] += 1
+        keyword_matches = scan_result.keyword_matches
+        weights = np.fromiter(
+            (km.weight for km in keyword_matches), dtype=np.float64, count=len(keyword_matches)
+        )
+        buckets = _severity_buckets(weights)
+        counts = np.bincount(buckets, minlength=len(_SEVERITY_BY_BUCKET)).tolist()
+        
+        # Severities in order of first appearance, as the per-match loop produced
+        present, first_index = np.unique(buckets, return_index=True)
+        severity_counts = {
+            _SEVERITY_BY_BUCKET[b].value: counts[b]
+            for b in present[np.argsort(first_index)].tolist()
+        }
         
         return {
             'total_matches': scan_result.total_matches,
@@ -389,3 +779,29 @@ class FastScanner:
                 for cat, count in scan_result.category_counts.items()
             },
         }
+
+
+@lru_cache(maxsize=None)
+def default_scanner() -> FastScanner:
+    """
+    Process-wide scanner with the default keyword library.
+    
+    Lets request handlers share one scanner (and its clause cache) instead
+    of building a new one per request.
+    """
+    return FastScanner()
+
+
+# Per-process scanner used by FastScanner.scan_clauses_batch workers
+_batch_scanner: Optional[FastScanner] = None
+
+
+def _init_batch_worker(keyword_library: KeywordLibrary) -> None:
+    """Process-pool initializer: build this worker's scanner once"""
+    global _batch_scanner
+    _batch_scanner = FastScanner(keyword_library)
+
+
+def _scan_clause_job(clause_text: str) -> ClauseScanResult:
+    """Scan one clause text in a worker process"""
+    return _batch_scanner._scan_clause_text(clause_text)
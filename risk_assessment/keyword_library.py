@@ -4,22 +4,147 @@ Comprehensive Keyword Library for Legal Risk Detection
 Contains 50-100 high-risk keywords/phrases per category with weights.
 """
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 import re
+import threading
 
 from .models import RiskCategory
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
-@dataclass
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    REGEX_AVAILABLE = False
+
+# Characters that re.IGNORECASE matches against ASCII letters (or whose
+# lower() is ASCII / changes length). Texts containing them are searched with
+# the per-keyword regexes so results stay identical.
+_CASEFOLD_SPECIAL = re.compile("[\u0130\u0131\u017f\u212a]")
+
+# ASCII characters that re's \s matches but the regex module's does not. The
+# regex module (whose Unicode tables and case folding also differ from re's
+# for some non-ASCII digits and the dotless i) is used only on ASCII texts
+# without them.
+_REGEX_MODULE_UNSAFE_ASCII = "\x1c\x1d\x1e\x1f"
+
+# An unescaped ^ or $ (errs towards finding one, e.g. [^...])
+_ANCHOR = re.compile(r"(?<!\\)[\^$]")
+
+_REGEX_METACHARACTERS = frozenset("\\[](){}|+*?^$.")
+
+# Rewrites for the hyperscan prefilter: to Python's re some non-ASCII (and
+# \x1c-\x1f) characters are \s or \d, so those classes accept them all
+_PREFILTER_CLASSES = (
+    (r"\s", r"(?:[\s\x1c-\x1f]|[^\x00-\x7f])"),
+    (r"\d", r"(?:\d|[^\x00-\x7f])"),
+)
+
+
+@lru_cache(maxsize=None)
+def _compile_prefilter(expressions: tuple[bytes, ...]):
+    """Compile a keyword prefilter database once per process"""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=list(expressions),
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=(
+            hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+        ),
+    )
+    return database
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as \\w in a str regex"""
+    return ch.isalnum() or ch == "_"
+
+
+def _required_prefix(pattern: str) -> Optional[str]:
+    """
+    Lowercased literal text every match of a regex keyword starts with, or
+    None if there is no usable one (shorter than 3 characters, or the pattern
+    has a top-level alternation).
+    """
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 1
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch in "()":
+            depth += 1 if ch == "(" else -1
+        elif ch == "|" and depth == 0:
+            return None
+        i += 1
+    
+    prefix = ""
+    for ch in pattern:
+        if ch in _REGEX_METACHARACTERS:
+            if ch in "?*{":
+                prefix = prefix[:-1]  # the last character is optional
+            break
+        prefix += ch
+    return prefix.lower() if len(prefix) >= 3 else None
+
+
+def _lowercase_literal_pattern(keyword: str) -> re.Pattern:
+    """
+    Case-sensitive equivalent of \\b<keyword>\\b for lowercased text.
+    
+    The pattern starts with the literal itself so re can search for it
+    directly (a leading \\b disables that); the leading word boundary is
+    checked instead by a fixed-width lookbehind from the end of the match.
+    """
+    lookbehind = r"(?<!\w" if _is_word_char(keyword[0]) else r"(?<=\w"
+    return re.compile(re.escape(keyword) + r"\b" + lookbehind + r"[\s\S]{%d})" % len(keyword))
+
+
+@dataclass(slots=True, frozen=True)
 class KeywordEntry:
-    """A keyword or phrase to detect"""
+    """A keyword or phrase to detect (immutable; shared by every scan)"""
     pattern: str
     weight: float  # 1.0 = normal, 2.0 = high concern, 3.0 = critical
     description: str
     is_regex: bool = False
     context_required: Optional[str] = None  # requires this context to be relevant
     negation_pattern: Optional[str] = None  # if this pattern exists, reduce weight
+    # Critical phrase: every hit is reported as a red flag (derived from weight)
+    is_red_flag: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "is_red_flag", self.weight >= 2.5)
+
+
+@dataclass(slots=True)
+class _PreparedText:
+    """Per-text state shared by every keyword lookup of one search"""
+    text: str
+    text_lower: Optional[str]  # None when lowercase matching would not be exact
+    literal_hits: Optional[dict[int, list[tuple[int, int, str]]]]  # automaton matches by slot
+    slots: Optional[list[int]]  # sorted slots that can match, None to try every keyword
+    fast_regex: dict[int, "regex.Pattern"]  # slot -> regex-module pattern usable on text
 
 
 class KeywordLibrary:
@@ -31,8 +156,40 @@ class KeywordLibrary:
     def __init__(self):
         self._keywords: dict[RiskCategory, list[KeywordEntry]] = {}
         self._compiled_patterns: dict[RiskCategory, list[tuple[re.Pattern, KeywordEntry]]] = {}
+        self._automaton = None
+        self._first_slot: dict[RiskCategory, int] = {}  # slot of each category's first entry
+        self._prefilter = None
+        self._fast_regex: dict[int, "regex.Pattern"] = {}  # slot -> regex-module pattern
+        self._lowered_literals: dict[int, re.Pattern] = {}  # slot -> case-sensitive pattern, compiled on first use
+        self._needles: dict[int, str] = {}  # slot -> lowercase text every match contains
+        self._regex_slots: set[int] = set()
         self._initialize_keywords()
         self._compile_patterns()
+        if AHOCORASICK_AVAILABLE:
+            self._build_automaton()
+        if HYPERSCAN_AVAILABLE:
+            self._build_prefilter()
+    
+    def __getstate__(self):
+        # The hyperscan database travels in its serialized form, so worker
+        # processes load it instead of compiling it again; per-thread
+        # scratch is rebuilt on unpickling
+        state = self.__dict__.copy()
+        prefilter = state.pop("_prefilter", None)
+        state.pop("_prefilter_local", None)
+        state["_prefilter_db"] = hyperscan.dumpb(prefilter) if prefilter is not None else None
+        return state
+    
+    def __setstate__(self, state):
+        prefilter_db = state.pop("_prefilter_db", None)
+        self.__dict__.update(state)
+        self._prefilter = None
+        if HYPERSCAN_AVAILABLE:
+            if prefilter_db is not None:
+                self._prefilter = hyperscan.loadb(prefilter_db, hyperscan.HS_MODE_BLOCK)
+                self._prefilter_local = threading.local()
+            else:
+                self._build_prefilter()
     
     def _initialize_keywords(self):
         """Initialize all keyword categories"""
@@ -49,16 +206,101 @@ class KeywordLibrary:
     
     def _compile_patterns(self):
         """Compile regex patterns for efficient matching"""
+        slot = 0
         for category, keywords in self._keywords.items():
+            self._first_slot[category] = slot
             self._compiled_patterns[category] = []
             for kw in keywords:
                 if kw.is_regex:
-                    pattern = re.compile(kw.pattern, re.IGNORECASE | re.MULTILINE)
+                    self._regex_slots.add(slot)
+                    # MULTILINE only matters to patterns with ^/$ anchors
+                    multiline = _ANCHOR.search(kw.pattern) is not None
+                    pattern = re.compile(kw.pattern, re.IGNORECASE | (re.MULTILINE if multiline else 0))
+                    needle = _required_prefix(kw.pattern)
+                    if needle is not None:
+                        self._needles[slot] = needle
+                    if REGEX_AVAILABLE:
+                        # Searches case-insensitive literal prefixes far faster than re
+                        self._fast_regex[slot] = regex.compile(
+                            kw.pattern, regex.IGNORECASE | (regex.MULTILINE if multiline else 0)
+                        )
                 else:
                     # Escape special regex chars and make word boundary matching
                     escaped = re.escape(kw.pattern)
                     pattern = re.compile(r'\b' + escaped + r'\b', re.IGNORECASE)
+                    self._needles[slot] = kw.pattern.lower()
                 self._compiled_patterns[category].append((pattern, kw))
+                slot += 1
+    
+    def _build_automaton(self):
+        """
+        Build one Aho-Corasick automaton over all literal keywords.
+        
+        Each keyword is numbered by its position in the compiled pattern
+        lists; the automaton maps the lowercased keyword to its length and
+        the numbers of every entry with that text.
+        """
+        automaton = ahocorasick.Automaton()
+        slot = 0
+        for patterns in self._compiled_patterns.values():
+            for _, kw in patterns:
+                if not kw.is_regex:
+                    key = kw.pattern.lower()
+                    if key in automaton:
+                        automaton.get(key)[1].append(slot)
+                    else:
+                        automaton.add_word(key, (len(key), [slot]))
+                slot += 1
+        automaton.make_automaton()
+        self._automaton = automaton
+    
+    def _build_prefilter(self):
+        """
+        Compile every keyword into one hyperscan database, numbered by slot.
+        
+        Used only to tell which keywords can match a text; the matches
+        themselves still come from the automaton and the re patterns. Word
+        boundaries are dropped and \\s / \\d widened so the database matches
+        a superset of what re would.
+        """
+        expressions = []
+        for patterns in self._compiled_patterns.values():
+            for _, kw in patterns:
+                if kw.is_regex:
+                    expression = kw.pattern
+                    for char_class, superset in _PREFILTER_CLASSES:
+                        expression = expression.replace(char_class, superset)
+                else:
+                    expression = re.escape(kw.pattern)
+                expressions.append(expression.encode())
+        
+        self._prefilter = _compile_prefilter(tuple(expressions))
+        self._prefilter_local = threading.local()
+    
+    def _candidate_slots(self, text: str) -> Optional[set[int]]:
+        """
+        Slots of the keywords that may match text, or None if unknown.
+        Only valid for text without _CASEFOLD_SPECIAL characters.
+        """
+        if self._prefilter is None:
+            return None
+        try:
+            data = text.encode("utf-8")
+        except UnicodeEncodeError:  # lone surrogates
+            return None
+        
+        # Scratch space is not shareable between threads
+        scratch = getattr(self._prefilter_local, "scratch", None)
+        if scratch is None:
+            scratch = self._prefilter_local.scratch = hyperscan.Scratch(self._prefilter)
+        
+        hits = set()
+        self._prefilter.scan(
+            data,
+            match_event_handler=lambda slot, start, end, flags, context: hits.add(slot),
+            scratch=scratch,
+        )
+        return hits
     
     def get_keywords(self, category: RiskCategory) -> list[KeywordEntry]:
         """Get all keywords for a category"""
@@ -678,6 +920,130 @@ class KeywordLibrary:
         Returns dict mapping category to list of (keyword, matches) tuples.
         Each match is (start, end, matched_text).
         """
+        prepared = self._prepare(text)
+        
+        results = {}
+        for category, patterns in self._compiled_patterns.items():
+            category_results = self._collect_category(prepared, patterns, self._first_slot[category])
+            if category_results:
+                results[category] = category_results
+        return results
+    
+    def _prepare(self, text: str) -> _PreparedText:
+        """
+        Work done once per text: lowercasing, the automaton pass and the
+        prefilter scan. Lowercase matching is exact for the (ASCII) literal
+        keywords unless the text has one of the _CASEFOLD_SPECIAL characters.
+        """
+        text_lower = None if _CASEFOLD_SPECIAL.search(text) else text.lower()
+        literal_hits = None
+        slots = None
+        if text_lower is not None:
+            if self._automaton is not None:
+                literal_hits = self._search_literals(text, text_lower)
+            candidates = self._candidate_slots(text)
+            if candidates is not None:
+                slots = sorted(candidates)
+            elif literal_hits is not None:
+                # Literals without automaton hits cannot match
+                slots = sorted(self._regex_slots.union(literal_hits))
+        return _PreparedText(text, text_lower, literal_hits, slots, self._fast_regex_for(text))
+    
+    def _fast_regex_for(self, text: str) -> dict[int, "regex.Pattern"]:
+        """regex-module patterns safe to use on text (empty to use re throughout)"""
+        if not self._fast_regex or not text.isascii():
+            return {}
+        if any(ch in text for ch in _REGEX_MODULE_UNSAFE_ASCII):
+            return {}
+        return self._fast_regex
+    
+    def _collect_category(
+        self,
+        prepared: _PreparedText,
+        patterns: list[tuple[re.Pattern, KeywordEntry]],
+        first_slot: int,
+    ) -> list[tuple[KeywordEntry, list[tuple[int, int, str]]]]:
+        """
+        One category's results. Only keywords in prepared.slots are visited
+        when it is known; literals come from the automaton hits or the
+        lowercased text when possible, everything else from finditer (with
+        the regex module where allowed).
+        """
+        text = prepared.text
+        text_lower = prepared.text_lower
+        literal_hits = prepared.literal_hits
+        needles = self._needles
+        
+        if prepared.slots is None:
+            entries = enumerate(patterns, first_slot)
+        else:
+            slots = prepared.slots
+            lo = bisect_left(slots, first_slot)
+            hi = bisect_left(slots, first_slot + len(patterns), lo)
+            entries = [(slot, patterns[slot - first_slot]) for slot in slots[lo:hi]]
+        
+        category_results = []
+        for slot, (pattern, keyword) in entries:
+            if keyword.is_regex:
+                # A substring test is far cheaper than a regex scan that finds nothing
+                needle = needles.get(slot)
+                if text_lower is not None and needle is not None and needle not in text_lower:
+                    matches = None
+                else:
+                    pattern = prepared.fast_regex.get(slot, pattern)
+                    matches = [(m.start(), m.end(), m.group()) for m in pattern.finditer(text)]
+            elif literal_hits is not None:
+                matches = literal_hits.get(slot)
+            elif text_lower is not None:
+                # Offsets are the same in both texts; report the original casing
+                needle = needles[slot]
+                if needle in text_lower:
+                    lowered = self._lowered_literals.get(slot)
+                    if lowered is None:
+                        # Only needed without the automaton, so not compiled up front
+                        lowered = _lowercase_literal_pattern(needle)
+                        self._lowered_literals[slot] = lowered
+                    matches = [
+                        (m.start(), m.end(), text[m.start():m.end()])
+                        for m in lowered.finditer(text_lower)
+                    ]
+                else:
+                    matches = None
+            else:
+                matches = [(m.start(), m.end(), m.group()) for m in pattern.finditer(text)]
+            if matches:
+                category_results.append((keyword, matches))
+        return category_results
+    
+    def _search_literals(self, text: str, text_lower: str) -> dict[int, list[tuple[int, int, str]]]:
+        """
+        Match every literal keyword in one pass over the lowercased text.
+        
+        Applies the same rules as the compiled \\b<keyword>\\b patterns:
+        a word boundary on both sides, and non-overlapping matches per
+        keyword, leftmost first.
+        """
+        hits: dict[int, list[tuple[int, int, str]]] = {}
+        n = len(text)
+        
+        for last, (length, slots) in self._automaton.iter(text_lower):
+            start = last - length + 1
+            end = last + 1
+            if (start > 0 and _is_word_char(text[start - 1])) == _is_word_char(text[start]):
+                continue
+            if _is_word_char(text[last]) == (end < n and _is_word_char(text[end])):
+                continue
+            for slot in slots:
+                matches = hits.get(slot)
+                if matches is None:
+                    hits[slot] = [(start, end, text[start:end])]
+                elif start >= matches[-1][1]:
+                    matches.append((start, end, text[start:end]))
+        
+        return hits
+    
+    def _search_all_regex(self, text: str) -> dict[RiskCategory, list[tuple[KeywordEntry, list[tuple[int, int, str]]]]]:
+        """search_all() using one compiled regex per keyword"""
         results = {}
         for category in self._compiled_patterns:
             category_results = []
@@ -693,17 +1059,12 @@ class KeywordLibrary:
     
     def search_category(self, text: str, category: RiskCategory) -> list[tuple[KeywordEntry, list[tuple[int, int, str]]]]:
         """Search text for keywords in a specific category"""
-        results = []
         if category not in self._compiled_patterns:
-            return results
+            return []
         
-        for pattern, keyword in self._compiled_patterns[category]:
-            matches = []
-            for match in pattern.finditer(text):
-                matches.append((match.start(), match.end(), match.group()))
-            if matches:
-                results.append((keyword, matches))
-        return results
+        return self._collect_category(
+            self._prepare(text), self._compiled_patterns[category], self._first_slot[category]
+        )
     
     def get_context(self, text: str, start: int, end: int, context_chars: int = 100) -> str:
         """Get surrounding context for a match"""
@@ -714,3 +1075,14 @@ class KeywordLibrary:
         suffix = "..." if context_end < len(text) else ""
         
         return prefix + text[context_start:context_end] + suffix
+
+
+@lru_cache(maxsize=None)
+def get_keyword_library() -> KeywordLibrary:
+    """
+    Process-wide keyword library, built on first use.
+    
+    The library is read-only once built, so scanners and engines share this
+    one instead of recompiling every pattern for each new instance.
+    """
+    return KeywordLibrary()
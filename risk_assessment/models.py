@@ -41,7 +41,7 @@ class SeverityLevel(Enum):
             return cls.CRITICAL
 
 
-@dataclass
+@dataclass(slots=True)
 class RedFlag:
     """A detected red flag in a clause"""
     phrase: str
@@ -51,7 +51,7 @@ class RedFlag:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class KeywordMatch:
     """A matched keyword in the text"""
     keyword: str
@@ -61,7 +61,7 @@ class KeywordMatch:
     context: str  # surrounding text for context
 
 
-@dataclass
+@dataclass(slots=True)
 class ClauseRisk:
     """Risk assessment for a single clause"""
     clause_id: str
@@ -96,7 +96,7 @@ class ClauseRisk:
     analysis_timestamp: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CategorySummary:
     """Summary of risks for a specific category"""
     category: RiskCategory
@@ -106,7 +106,7 @@ class CategorySummary:
     clauses: list[str]  # clause IDs
 
 
-@dataclass
+@dataclass(slots=True)
 class TopRisk:
     """A top-priority risk item"""
     rank: int
@@ -117,7 +117,7 @@ class TopRisk:
     action: str
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskDistribution:
     """Distribution of risks by severity"""
     critical: int = 0
@@ -130,7 +130,7 @@ class RiskDistribution:
         return self.critical + self.high + self.medium + self.low
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskSummary:
     """Summary of document-level risk"""
     overall_score: int
@@ -140,7 +140,7 @@ class RiskSummary:
     recommendation: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionItem:
     """An action item from the risk assessment"""
     priority: int
@@ -151,7 +151,7 @@ class ActionItem:
     talking_point: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentMetadata:
     """Metadata about the analyzed document"""
     filename: str
@@ -161,7 +161,7 @@ class DocumentMetadata:
     processing_time_seconds: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentRisk:
     """Complete risk assessment for a document"""
     metadata: DocumentMetadata
@@ -189,7 +189,7 @@ class DocumentRisk:
     action_plan: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """A structured recommendation"""
     priority: int
@@ -201,7 +201,7 @@ class Recommendation:
     negotiation_tip: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class QuickScanResult:
     """Result from the fast rule-based scan"""
     total_matches: int
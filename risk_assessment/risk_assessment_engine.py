@@ -20,7 +20,7 @@ from .models import (
     QuickScanResult,
     Recommendation,
 )
-from .keyword_library import KeywordLibrary
+from .keyword_library import get_keyword_library
 from .fast_scanner import FastScanner
 from .ai_analyzer import AIAnalyzer, AnalysisContext
 from .risk_scorer import RiskScorer
@@ -73,7 +73,7 @@ class RiskAssessmentEngine:
             parallel_analysis: Whether to analyze clauses in parallel
             max_workers: Number of parallel workers for AI analysis
         """
-        self.keyword_library = KeywordLibrary()
+        self.keyword_library = get_keyword_library()
         self.fast_scanner = FastScanner(self.keyword_library)
         self.ai_analyzer = AIAnalyzer(api_key) if use_ai else None
         self.risk_scorer = RiskScorer()
@@ -8,8 +8,11 @@ Contains test cases for:
 - Ambiguous contracts
 """
 
+import json
+import re
 import unittest
 from datetime import datetime
+from types import SimpleNamespace
 
 from risk_assessment import (
     RiskAssessmentEngine,
@@ -19,8 +22,10 @@ from risk_assessment import (
     FastScanner,
     RiskScorer,
     DocumentAggregator,
+    IncrementalAggregator,
 )
-from risk_assessment.ai_analyzer import AnalysisContext
+from risk_assessment.ai_analyzer import AIAnalyzer, AnalysisContext
+from risk_assessment.keyword_library import AHOCORASICK_AVAILABLE
 
 
 # ============ SAMPLE CONTRACTS ============
@@ -232,6 +237,19 @@ class TestKeywordLibrary(unittest.TestCase):
         self.assertIn(RiskCategory.FINANCIAL, results)  # unlimited liability
         self.assertIn(RiskCategory.CONFIDENTIALITY, results)  # perpetual confidentiality
         self.assertIn(RiskCategory.DISPUTE_RESOLUTION, results)  # binding arbitration
+    
+    @unittest.skipUnless(AHOCORASICK_AVAILABLE, "pyahocorasick not installed")
+    def test_search_all_automaton_matches_regex(self):
+        """Test the Aho-Corasick keyword pass returns the same matches as the regexes"""
+        texts = [
+            EXTREMELY_UNFAVORABLE_CONTRACT,
+            BALANCED_CONTRACT,
+            HIGHLY_FAVORABLE_CONTRACT,
+            AMBIGUOUS_CONTRACT,
+            "SLA_terms: 99.9% uptime, 99.9%x, unlimited liabilityunlimited liability",
+        ]
+        for text in texts:
+            self.assertEqual(self.library.search_all(text), self.library._search_all_regex(text))
 
 
 class TestFastScanner(unittest.TestCase):
@@ -275,6 +293,77 @@ class TestFastScanner(unittest.TestCase):
         self.assertGreater(len(result.keyword_matches), 0)
         self.assertTrue(result.needs_deep_analysis)
     
+    def test_scan_clause_cached_rescan(self):
+        """Re-scanning unchanged text reuses the cached scan under the new clause ID"""
+        clause = "Customer shall indemnify Provider for unlimited liability exposure."
+        first = self.scanner.scan_clause("clause_1", clause)
+        first.keyword_matches.clear()
+        second = self.scanner.scan_clause("clause_2", clause)
+        
+        self.assertEqual(second.clause_id, "clause_2")
+        self.assertGreater(len(second.keyword_matches), 0)
+    
+    def test_dangerous_patterns_single_pass(self):
+        """The combined dangerous-pattern pass finds what each pattern finds alone"""
+        text = (
+            "Customer shall indemnify Provider against any and all claims, "
+            "without limitation. Licensee agrees to hold harmless all and any losses "
+            "without exception. Provider may order immediate termination without notice "
+            "or immediate termination with no cure. Binding arbitration shall be held "
+            "in London, and all arbitration in Singapore."
+        )
+        for subject in (text, text + " \u00a7 12"):
+            expected = [
+                match.span()
+                for pattern in FastScanner.DANGEROUS_PATTERNS
+                for match in re.finditer(pattern, subject, re.IGNORECASE | re.DOTALL)
+            ]
+            self.assertTrue(all(
+                re.search(pattern, subject, re.IGNORECASE | re.DOTALL)
+                for pattern in FastScanner.DANGEROUS_PATTERNS
+            ))
+            self.assertEqual(self.scanner._dangerous.find(subject), expected)
+    
+    def test_scan_clauses_batch_matches_scan_clause(self):
+        """Scanning in worker processes gives the same results as scan_clause, in input order"""
+        paragraphs = [p for p in EXTREMELY_UNFAVORABLE_CONTRACT.split("\n\n") if p.strip()]
+        paragraphs += BALANCED_CONTRACT.split("\n\n")[:3]
+        clauses = [(f"clause_{i}", text) for i, text in enumerate(paragraphs + paragraphs[:2])]
+        
+        batched = self.scanner.scan_clauses_batch(clauses, max_workers=2)
+        sequential = FastScanner()
+        expected = [sequential.scan_clause(clause_id, text) for clause_id, text in clauses]
+        
+        self.assertEqual(batched, expected)
+    
+    def test_scan_document_cached_rescan(self):
+        """Re-scanning an unchanged document gives the same result"""
+        first = self.scanner.scan_document(EXTREMELY_UNFAVORABLE_CONTRACT)
+        first.keyword_matches.clear()
+        second = self.scanner.scan_document(EXTREMELY_UNFAVORABLE_CONTRACT)
+        
+        self.assertGreater(len(second.keyword_matches), 0)
+        self.assertEqual(second.total_matches, len(second.keyword_matches))
+    
+    def test_scan_from_matches_equals_scan_clause(self):
+        """Reusing document matches gives the same clause scan as re-scanning"""
+        scan_result = self.scanner.scan_document(EXTREMELY_UNFAVORABLE_CONTRACT)
+        offset = 0
+        for i, paragraph in enumerate(EXTREMELY_UNFAVORABLE_CONTRACT.split("\n\n")):
+            reused = self.scanner.scan_from_matches(
+                f"p{i}", paragraph, offset, scan_result.keyword_matches
+            )
+            self.assertEqual(reused, self.scanner.scan_clause(f"p{i}", paragraph))
+            offset += len(paragraph) + 2
+    
+    def test_scan_document_early_exit(self):
+        """Early exit reaches the same verdict while skipping the keyword search"""
+        full = self.scanner.scan_document(EXTREMELY_UNFAVORABLE_CONTRACT)
+        quick = self.scanner.scan_document(EXTREMELY_UNFAVORABLE_CONTRACT, early_exit=True)
+        
+        self.assertEqual(quick.estimated_risk_level, full.estimated_risk_level)
+        self.assertEqual(quick.total_matches, 0)
+    
     def test_heatmap_generation(self):
         """Test heatmap data generation"""
         scan_result = self.scanner.scan_document(EXTREMELY_UNFAVORABLE_CONTRACT)
@@ -430,6 +519,292 @@ class TestDocumentAggregator(unittest.TestCase):
         
         self.assertIn("# Risk Assessment Report", markdown)
         self.assertIn("test.pdf", markdown)
+    
+    def test_incremental_matches_aggregate(self):
+        """Test streaming aggregation gives the same result as aggregate()"""
+        from risk_assessment.models import ClauseRisk
+        
+        risks = [
+            ClauseRisk(
+                clause_id=f"clause_{i}",
+                clause_text="Test",
+                clause_type="liability",
+                category=category,
+                severity=SeverityLevel.from_score(score),
+                score=score,
+                confidence=80,
+                primary_risk=f"Risk {i}",
+                detailed_explanation="",
+                specific_concerns=[],
+                impact_if_triggered="",
+                likelihood="HIGH",
+                recommendation="Review",
+                red_flags=["one-sided"] if score >= 60 else [],
+            )
+            for i, (category, score) in enumerate([
+                (RiskCategory.LEGAL_LIABILITY, 95),
+                (RiskCategory.FINANCIAL, 20),
+                (RiskCategory.TERMINATION, 80),
+                (RiskCategory.LEGAL_LIABILITY, 95),
+                (RiskCategory.FINANCIAL, 60),
+                (RiskCategory.OPERATIONAL, 45),
+            ] * 3)
+        ]
+        
+        incremental = IncrementalAggregator(self.aggregator)
+        for risk in risks:
+            incremental.push(risk)
+        streamed = incremental.finalize("test.pdf", 5, 2.5)
+        expected = self.aggregator.aggregate(risks, "test.pdf", 5, 2.5)
+        
+        streamed.metadata.analysis_timestamp = expected.metadata.analysis_timestamp
+        self.assertEqual(streamed, expected)
+    
+    def test_aggregate_batch_matches_aggregate(self):
+        """Aggregating in worker processes gives aggregate()'s results, in input order"""
+        from risk_assessment.models import ClauseRisk
+        
+        def risks(scores):
+            return [
+                ClauseRisk(
+                    clause_id=f"clause_{i}",
+                    clause_text="Test",
+                    clause_type="liability",
+                    category=category,
+                    severity=SeverityLevel.from_score(score),
+                    score=score,
+                    confidence=80,
+                    primary_risk=f"Risk {i}",
+                    detailed_explanation="",
+                    specific_concerns=[],
+                    impact_if_triggered="",
+                    likelihood="HIGH",
+                    recommendation="Review",
+                    red_flags=["one-sided"] if score >= 60 else [],
+                )
+                for i, (category, score) in enumerate(zip(
+                    [RiskCategory.LEGAL_LIABILITY, RiskCategory.FINANCIAL, RiskCategory.TERMINATION] * 4,
+                    scores,
+                ))
+            ]
+        
+        jobs = [
+            (risks([95, 20, 80, 45]), "a.pdf", 3, 1.0),
+            (risks([10, 15, 30]), "b.pdf", 1, 0.5),
+            (risks([60, 70, 90, 95, 25, 40]), "c.pdf", 8, 2.0, {"executive_summary": "Summary"}),
+        ]
+        
+        batched = self.aggregator.aggregate_batch(jobs, max_workers=2)
+        expected = [self.aggregator.aggregate(*job) for job in jobs]
+        
+        self.assertEqual([doc.metadata.filename for doc in batched], ["a.pdf", "b.pdf", "c.pdf"])
+        for doc, expected_doc in zip(batched, expected):
+            doc.metadata.analysis_timestamp = expected_doc.metadata.analysis_timestamp
+        self.assertEqual(batched, expected)
+    
+    def test_summary_analysis_level(self):
+        """Test summary-level aggregation fills only the summary fields"""
+        from risk_assessment.models import ClauseRisk
+        
+        risks = [
+            ClauseRisk(
+                clause_id=f"clause_{i}",
+                clause_text="Test",
+                clause_type="liability",
+                category=RiskCategory.LEGAL_LIABILITY,
+                severity=SeverityLevel.from_score(score),
+                score=score,
+                confidence=80,
+                primary_risk=f"Risk {i}",
+                detailed_explanation="",
+                specific_concerns=[],
+                impact_if_triggered="",
+                likelihood="HIGH",
+                recommendation="Review",
+            )
+            for i, score in enumerate([95, 70, 40, 10])
+        ]
+        
+        full = self.aggregator.aggregate(risks, "test.pdf")
+        summary = self.aggregator.aggregate(risks, "test.pdf", analysis_level="summary")
+        
+        self.assertEqual(summary.risk_summary, full.risk_summary)
+        self.assertEqual(summary.top_risks, full.top_risks)
+        self.assertEqual(summary.executive_summary, full.executive_summary)
+        self.assertEqual(summary.category_summaries, {})
+        self.assertEqual(summary.must_address_immediately, [])
+        self.assertEqual(summary.action_plan, [])
+        
+        with self.assertRaises(ValueError):
+            self.aggregator.aggregate(risks, analysis_level="partial")
+    
+    def test_score_kernels_agree(self):
+        """The loop and NumPy reductions give the same results, empty categories included"""
+        import numpy as np
+        from risk_assessment._agg_kernels import _scan_scores_loop, _scan_scores_numpy, scan_scores
+        
+        severities = np.array([0, 1, 2, 1], dtype=np.int8)
+        categories = np.array([1, 3, 1, 3], dtype=np.int8)
+        for scores in (np.array([30, 90, 10, 55]), np.array([30.5, 90, 10, 55])):
+            args = (scores, severities, categories, 4, 6)
+            for loop_result, numpy_result in zip(_scan_scores_loop(*args), _scan_scores_numpy(*args)):
+                np.testing.assert_array_equal(loop_result, numpy_result)
+            
+            total, _, _, _, cat_max, cat_min = scan_scores(*args)
+            self.assertIs(type(total), type(scores.sum().item()))
+            self.assertEqual(cat_max.tolist(), [0, scores[0], 0, 90, 0, 0])
+            self.assertEqual(cat_min.tolist(), [0, 10, 0, 55, 0, 0])
+
+
+class _FakeCompletions:
+    """
+    Stand-in for client.chat.completions whose streaming calls raise
+    stream_error; respond maps a user prompt to the response content.
+    """
+    
+    def __init__(self, stream_error, respond=None):
+        self.stream_error = stream_error
+        self.respond = respond or (lambda prompt: "{}")
+        self.calls = []
+        self.prompts = []
+    
+    def create(self, stream=False, **kwargs):
+        self.calls.append(stream)
+        if stream:
+            raise self.stream_error
+        prompt = kwargs["messages"][-1]["content"] if "messages" in kwargs else ""
+        self.prompts.append(prompt)
+        message = SimpleNamespace(content=self.respond(prompt))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class _FakeStatusError(Exception):
+    """Shaped like groq.APIStatusError: carries the HTTP status code"""
+    
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+class TestAIAnalyzer(unittest.TestCase):
+    """Test the Groq request handling (with a fake client)"""
+    
+    def _analyzer(self, stream_error=None, respond=None):
+        analyzer = AIAnalyzer(api_key="test", stream=stream_error is not None)
+        completions = _FakeCompletions(stream_error, respond)
+        analyzer._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return analyzer, completions
+    
+    def test_broken_stream_falls_back_for_that_request(self):
+        """A stream that breaks before any output is retried without streaming"""
+        analyzer, completions = self._analyzer(ValueError("bad event stream"))
+        
+        self.assertEqual(analyzer._complete(model=analyzer.MODEL), "{}")
+        self.assertEqual(completions.calls, [True, False])
+        self.assertTrue(analyzer.stream)
+    
+    def test_request_errors_are_not_retried(self):
+        """Timeouts and API errors propagate and leave streaming enabled"""
+        analyzer, completions = self._analyzer(TimeoutError("read timed out"))
+        
+        with self.assertRaises(TimeoutError):
+            analyzer._complete(model=analyzer.MODEL)
+        self.assertEqual(completions.calls, [True])
+        self.assertTrue(analyzer.stream)
+    
+    def test_rejected_stream_falls_back(self):
+        """A 400 for the streamed request (e.g. JSON mode) is retried without streaming"""
+        analyzer, completions = self._analyzer(_FakeStatusError(400))
+        
+        self.assertEqual(
+            analyzer._complete(model=analyzer.MODEL, response_format={"type": "json_object"}),
+            "{}",
+        )
+        self.assertEqual(completions.calls, [True, False])
+    
+    def test_rate_limit_is_not_retried(self):
+        """Rate-limit and auth errors propagate without a second request"""
+        for status in (429, 401):
+            analyzer, completions = self._analyzer(_FakeStatusError(status))
+            
+            with self.assertRaises(_FakeStatusError):
+                analyzer._complete(model=analyzer.MODEL)
+            self.assertEqual(completions.calls, [True])
+    
+    def test_cached_analysis_is_copied(self):
+        """Changing a returned analysis doesn't change later cache hits"""
+        analyzer, completions = self._analyzer(ValueError("bad event stream"))
+        clause = "Customer shall indemnify Provider for all claims."
+        
+        first = analyzer.analyze_clause("clause_1", clause, AnalysisContext())
+        first.red_flags.append("edited")
+        first.specific_concerns.append("edited")
+        second = analyzer.analyze_clause("clause_2", clause, AnalysisContext())
+        second.positive_elements.append("edited")
+        third = analyzer.analyze_clauses_batch([("clause_3", clause)], AnalysisContext())[0]
+        
+        self.assertEqual(len(completions.calls), 2)  # one request, then cache hits
+        self.assertEqual(third.clause_id, "clause_3")
+        self.assertEqual(second.red_flags, [])
+        self.assertEqual(second.specific_concerns, [])
+        self.assertEqual(third.positive_elements, [])
+    
+    def test_chunk_by_token_budget(self):
+        """Clauses are packed by size into requests under the budget and clause limit"""
+        analyzer = AIAnalyzer(api_key="test")
+        pending = [
+            (i, f"clause_{i}", "x" * length, [])
+            for i, length in enumerate([4000, 40, 2000, 400, 40, 3000] + [40] * 12)
+        ]
+        
+        chunks = analyzer._chunk_by_token_budget(pending)
+        
+        packed = [item for chunk in chunks for item in chunk]
+        self.assertEqual(sorted(packed), sorted(pending))
+        self.assertEqual([len(item[2]) for item in packed], sorted(len(item[2]) for item in pending))
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), analyzer.MAX_CLAUSES_PER_REQUEST)
+            if len(chunk) > 1:
+                tokens = sum(len(item[2]) // 4 + 1 for item in chunk)
+                self.assertLessEqual(tokens, analyzer.BATCH_TOKEN_BUDGET)
+    
+    def test_batch_matches_results_by_id(self):
+        """Multi-clause entries are matched to clauses by id, whatever their order"""
+        clauses = [(f"clause_{i}", f"Clause number {i}.") for i in range(3)]
+        
+        def respond(prompt):
+            entries = [{"clause_id": clause_id, "risk_score": 10 * (i + 1)} for i, (clause_id, _) in enumerate(clauses)]
+            return json.dumps({"analyses": entries[::-1]})
+        
+        analyzer, completions = self._analyzer(respond=respond)
+        risks = analyzer.analyze_clauses_batch(clauses, AnalysisContext())
+        
+        self.assertEqual(len(completions.prompts), 1)
+        self.assertIn("CLAUSE [clause_2]:\nClause number 2.", completions.prompts[0])
+        self.assertEqual([r.clause_id for r in risks], ["clause_0", "clause_1", "clause_2"])
+        self.assertEqual([r.score for r in risks], [10, 20, 30])
+        self.assertTrue(all(r.ai_analyzed for r in risks))
+    
+    def test_batch_falls_back_per_clause(self):
+        """Clauses missing or garbled in the multi-clause reply are analyzed on their own"""
+        clauses = [(f"clause_{i}", f"Clause number {i}.") for i in range(3)]
+        
+        def respond(prompt):
+            if prompt.startswith("Analyze each of these"):
+                return json.dumps({"analyses": [{"clause_id": "clause_0", "risk_score": 10}, "garbled"]})
+            return json.dumps({"risk_score": 99})
+        
+        analyzer, completions = self._analyzer(respond=respond)
+        risks = analyzer.analyze_clauses_batch(clauses, AnalysisContext())
+        
+        self.assertEqual(len(completions.prompts), 3)  # one batch, then clause_1 and clause_2
+        self.assertEqual([r.score for r in risks], [10, 99, 99])
+        
+        malformed, completions = self._analyzer(respond=lambda prompt: "not json" if "CLAUSE [" in prompt else "{}")
+        risks = malformed.analyze_clauses_batch(clauses, AnalysisContext())
+        
+        self.assertEqual(len(completions.prompts), 4)  # the batch, then each clause
+        self.assertEqual([r.clause_id for r in risks], ["clause_0", "clause_1", "clause_2"])
 
 
 class TestRiskAssessmentEngine(unittest.TestCase):
@@ -0,0 +1,113 @@
+"""
+Test Suite for the RAG Chatbot vector store
+
+Contains test cases for:
+- The FP16 embedding store kept next to the ChromaDB collection
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from rag_chatbot.vector_store import _EmbeddingStore
+
+
+def _vectors(*values):
+    """One 4-dimensional row per value"""
+    return np.array([[value] * 4 for value in values], dtype=np.float16)
+
+
+class TestEmbeddingStore(unittest.TestCase):
+    """Test the append-only embedding store"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self._tmp.name, "store", "embeddings")
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def _store(self, min_tombstones=1024):
+        store = _EmbeddingStore(self.prefix)
+        store.COMPACT_MIN_TOMBSTONES = min_tombstones
+        return store
+    
+    def test_append_and_get(self):
+        """Appended rows are returned by id as FP32"""
+        store = self._store()
+        store.append(["a", "b"], _vectors(1, 2))
+        
+        self.assertEqual(store.get(["b", "a"]).tolist(), [[2.0] * 4, [1.0] * 4])
+        self.assertEqual(store.get(["a"]).dtype, np.float32)
+    
+    def test_re_add_replaces_row(self):
+        """Adding a stored id again replaces it, and removing it keeps it removed"""
+        store = self._store()
+        store.append(["a", "b"], _vectors(1, 2))
+        store.append(["a"], _vectors(3))
+        
+        self.assertEqual(store.get(["a"]).tolist(), [[3.0] * 4])
+        self.assertEqual(store.ids, ["", "b", "a"])
+        
+        store.remove(["a"])
+        store._compact()
+        
+        self.assertNotIn("a", store)
+        self.assertEqual(store.ids, ["b"])
+        self.assertEqual(store.get(["b"]).tolist(), [[2.0] * 4])
+    
+    def test_replay(self):
+        """A reopened store has the same rows, and a torn last log line is dropped"""
+        store = self._store()
+        store.append(["a", "b", "c"], _vectors(1, 2, 3))
+        store.append(["b"], _vectors(4))
+        store.remove(["c"])
+        with open(store.log_path, "a", encoding="utf-8") as f:
+            f.write('["remove", "a"')
+        
+        reopened = self._store()
+        
+        self.assertEqual(reopened.ids, store.ids)
+        self.assertNotIn("c", reopened)
+        self.assertEqual(reopened.get(["a", "b"]).tolist(), [[1.0] * 4, [4.0] * 4])
+        with open(store.log_path, "rb") as f:
+            self.assertTrue(f.read().endswith(b"\n"))
+    
+    def test_compaction(self):
+        """Once half the rows are tombstones they move to a new matrix file"""
+        store = self._store(min_tombstones=2)
+        store.append(["a", "b", "c"], _vectors(1, 2, 3))
+        old_matrix_path = store.matrix_path
+        store.remove(["a", "c"])
+        
+        self.assertEqual(store.generation, 1)
+        self.assertEqual(store.ids, ["b"])
+        self.assertFalse(os.path.exists(old_matrix_path))
+        
+        reopened = self._store()
+        self.assertEqual(reopened.ids, ["b"])
+        self.assertEqual(reopened.get(["b"]).tolist(), [[2.0] * 4])
+    
+    def test_legacy_index_migration(self):
+        """A whole-file JSON index is rewritten as a log without its tombstones"""
+        os.makedirs(os.path.dirname(self.prefix))
+        matrix = np.memmap(self.prefix + ".f16", dtype=np.float16, mode="w+", shape=(4, 4))
+        matrix[:3] = _vectors(1, 2, 3)
+        matrix.flush()
+        del matrix
+        with open(self.prefix + ".json", "w", encoding="utf-8") as f:
+            json.dump({"ids": ["a", "", "c"], "dim": 4, "capacity": 4}, f)
+        
+        store = self._store()
+        
+        self.assertFalse(os.path.exists(self.prefix + ".json"))
+        self.assertEqual(store.ids, ["a", "c"])
+        self.assertEqual(store.get(["c"]).tolist(), [[3.0] * 4])
+        self.assertEqual(self._store().ids, ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)